@@ -1,10 +1,10 @@
-"""
-Entry point for running the MCP server as a module.
-
-Usage:
-    python -m mcp.release_notes_server
-"""
-from . import main
-
-if __name__ == "__main__":
-    main()
+"""
+Entry point for running the MCP server as a module.
+
+Usage:
+    python -m mcp.release_notes_server
+"""
+from . import main
+
+if __name__ == "__main__":
+    main()
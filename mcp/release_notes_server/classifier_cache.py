@@ -0,0 +1,158 @@
+"""
+On-disk cache of commit classification results.
+
+CI-driven release notes usually re-run over a moving window, so most
+commits were already classified by the previous run. Results are stored
+in a SQLite database (stdlib only) keyed by commit SHA plus a fingerprint
+of everything else the classification depends on: the watchlist terms and
+the classifier rules version. A SHA is content-addressed, but the file
+stats git reports for it are not: rename detection (-l200 vs --no-renames)
+changes the paths and line counts, so each key also carries a digest of
+the commit's files_changed.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever classification rules change so stale results are not reused
+CLASSIFIER_CACHE_VERSION = 3
+
+CACHE_FILENAME = "classifier.sqlite3"
+
+# Fields categorize_commit adds to a commit; only these are cached
+CACHED_FIELDS = (
+    'category',
+    'is_breaking',
+    'is_large',
+    'customer_impacts',
+    'has_customer_impact',
+    'confidence',
+    'total_lines_changed',
+    'files_changed_count',
+)
+
+# SQLite's default limit on bound parameters is 999
+_QUERY_BATCH = 500
+
+
+def watchlist_fingerprint(watchlist: Dict[str, Any]) -> str:
+    """
+    Fingerprint the watchlist fields and rules version classification depends on.
+
+    Args:
+        watchlist: Customer watchlist dict
+
+    Returns:
+        Hex digest identifying this classification configuration
+    """
+    payload = json.dumps([
+        CLASSIFIER_CACHE_VERSION,
+        watchlist.get('watched_features', []),
+        watchlist.get('critical_customers', []),
+        watchlist.get('high_risk_paths', []),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def commit_cache_key(commit: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a commit: its SHA plus a digest of its file stats.
+
+    Size and path-derived fields (is_large, files_changed_count, path
+    impacts) depend on how git log reported the files, not just on the SHA.
+
+    Args:
+        commit: Commit dict with 'sha' and 'files_changed'
+
+    Returns:
+        Key string "<sha>:<files digest>"
+    """
+    files = json.dumps(commit.get('files_changed', []), sort_keys=True)
+    return f"{commit['sha']}:{hashlib.sha256(files.encode('utf-8')).hexdigest()}"
+
+
+class ClassifierCache:
+    """SQLite-backed store of classification fields keyed by (commit key, fingerprint)."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Open (creating if needed) the cache database in cache_dir.
+
+        Args:
+            cache_dir: Directory for the cache file (~ is expanded)
+
+        Raises:
+            OSError: If the directory can't be created
+            sqlite3.Error: If the database can't be opened
+        """
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self._conn = sqlite3.connect(self.path)
+        # The sha column holds commit_cache_key() values; it keeps its name so
+        # existing cache files still open (the version bump retires old rows)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS classifications ("
+                " sha TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL,"
+                " fields TEXT NOT NULL,"
+                " PRIMARY KEY (sha, fingerprint))"
+            )
+
+    def get_many(self, keys: List[str], fingerprint: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached classification fields for several commits.
+
+        Args:
+            keys: Values from commit_cache_key()
+            fingerprint: Value from watchlist_fingerprint()
+
+        Returns:
+            Dict mapping each cached key to its classification fields
+        """
+        found = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start:start + _QUERY_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT sha, fields FROM classifications "
+                f"WHERE fingerprint = ? AND sha IN ({placeholders})",
+                [fingerprint, *batch]
+            )
+            for key, fields in rows:
+                found[key] = json.loads(fields)
+        return found
+
+    def put_many(self, commits: Iterable[Dict[str, Any]], fingerprint: str) -> None:
+        """
+        Store the classification fields of enriched commits.
+
+        Args:
+            commits: Enriched commits (commits without a 'sha' are skipped)
+            fingerprint: Value from watchlist_fingerprint()
+        """
+        rows: List[Tuple[str, str, str]] = [
+            (
+                commit_cache_key(commit),
+                fingerprint,
+                json.dumps({field: commit[field] for field in CACHED_FIELDS})
+            )
+            for commit in commits
+            if commit.get('sha')
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO classifications (sha, fingerprint, fields) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
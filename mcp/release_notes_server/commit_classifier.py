@@ -1,350 +1,615 @@
-"""
-Commit categorization and customer impact detection.
-
-This module analyzes commits to:
-- Categorize by type (feature, fix, breaking, etc.)
-- Detect breaking changes
-- Identify customer-impacting changes
-- Match against customer watchlist
-"""
-import re
-import logging
-from typing import Dict, List, Any, Set
-
-logger = logging.getLogger(__name__)
-
-
-# Conventional commit type mappings
-CONVENTIONAL_COMMIT_TYPES = {
-    'feat': 'feature',
-    'feature': 'feature',
-    'fix': 'bugfix',
-    'bug': 'bugfix',
-    'chore': 'chore',
-    'refactor': 'refactor',
-    'perf': 'performance',
-    'performance': 'performance',
-    'docs': 'documentation',
-    'doc': 'documentation',
-    'test': 'testing',
-    'tests': 'testing',
-    'style': 'chore',
-    'build': 'chore',
-    'ci': 'chore',
-}
-
-# Keyword heuristics for non-conventional commits
-KEYWORD_PATTERNS = {
-    'bugfix': ['fix', 'bug', 'patch', 'issue', 'resolve', 'correct'],
-    'feature': ['add', 'new', 'feature', 'implement', 'support'],
-    'performance': ['optimize', 'performance', 'faster', 'speed', 'improve'],
-    'documentation': ['doc', 'docs', 'readme', 'comment', 'documentation'],
-    'testing': ['test', 'tests', 'testing', 'spec', 'coverage'],
-    'refactor': ['refactor', 'restructure', 'reorganize', 'clean'],
-    'breaking': ['breaking', 'break', 'deprecated', 'remove', 'drop'],
-}
-
-
-def parse_conventional_commit(subject: str) -> Dict[str, Any]:
-    """
-    Parse conventional commit format: type(scope)!: description
-
-    Args:
-        subject: Commit subject line
-
-    Returns:
-        dict with type, scope, breaking, description
-    """
-    # Pattern: type(scope)!: description
-    # or: type!: description
-    # or: type: description
-    pattern = r'^(\w+)(?:\(([^)]+)\))?(!)?\s*:\s*(.+)$'
-    match = re.match(pattern, subject.strip())
-
-    if match:
-        commit_type = match.group(1).lower()
-        scope = match.group(2) or None
-        breaking_marker = match.group(3) == '!'
-        description = match.group(4).strip()
-
-        # Map to category
-        category = CONVENTIONAL_COMMIT_TYPES.get(commit_type, 'other')
-
-        return {
-            'is_conventional': True,
-            'type': commit_type,
-            'scope': scope,
-            'breaking_marker': breaking_marker,
-            'description': description,
-            'category': category
-        }
-
-    return {
-        'is_conventional': False,
-        'type': None,
-        'scope': None,
-        'breaking_marker': False,
-        'description': subject,
-        'category': None
-    }
-
-
-def detect_breaking_change(subject: str, body: str) -> bool:
-    """
-    Detect if commit is a breaking change.
-
-    Args:
-        subject: Commit subject
-        body: Commit body
-
-    Returns:
-        True if breaking change detected
-    """
-    # Check for ! in subject (conventional commit marker)
-    parsed = parse_conventional_commit(subject)
-    if parsed['breaking_marker']:
-        return True
-
-    # Check for "BREAKING CHANGE:" in body
-    body_lower = body.lower()
-    breaking_patterns = [
-        'breaking change:',
-        'breaking:',
-        'breaking-change:',
-    ]
-
-    for pattern in breaking_patterns:
-        if pattern in body_lower:
-            return True
-
-    return False
-
-
-def categorize_by_keywords(subject: str, body: str) -> str:
-    """
-    Categorize commit using keyword heuristics (fallback).
-
-    Args:
-        subject: Commit subject
-        body: Commit body
-
-    Returns:
-        Category string
-    """
-    text = (subject + ' ' + body).lower()
-
-    # Check each category's keywords
-    for category, keywords in KEYWORD_PATTERNS.items():
-        for keyword in keywords:
-            if keyword in text:
-                # Special handling for 'breaking' - don't use as primary category
-                if category == 'breaking':
-                    continue
-                return category
-
-    return 'other'
-
-
-def match_customer_impacts(
-    subject: str,
-    body: str,
-    file_paths: List[str],
-    watchlist: Dict[str, Any]
-) -> Dict[str, Any]:
-    """
-    Match commit against customer watchlist.
-
-    Args:
-        subject: Commit subject
-        body: Commit body
-        file_paths: List of changed file paths
-        watchlist: Customer watchlist dict
-
-    Returns:
-        dict with matched_features, matched_paths, impact_count
-    """
-    text = (subject + ' ' + body).lower()
-
-    # Use set operations for O(n+m) instead of O(n*m)
-    watched_features = watchlist.get('watched_features', [])
-    watched_features_lower = {feature.lower(): feature for feature in watched_features}
-    matched_features = [
-        watched_features_lower[term]
-        for term in watched_features_lower
-        if term in text
-    ]
-
-    # Match high-risk paths - use set to avoid duplicates, O(n*m) but necessary
-    high_risk_paths = watchlist.get('high_risk_paths', [])
-    matched_paths_set = {
-        risk_path
-        for changed_file in file_paths
-        for risk_path in high_risk_paths
-        if changed_file.startswith(risk_path)
-    }
-    matched_paths = sorted(matched_paths_set)
-
-    # Match critical customers - use set operations
-    critical_customers = watchlist.get('critical_customers', [])
-    critical_customers_lower = {customer.lower(): customer for customer in critical_customers}
-    matched_customers = [
-        critical_customers_lower[term]
-        for term in critical_customers_lower
-        if term in text
-    ]
-
-    impact_count = len(matched_features) + len(matched_paths) + len(matched_customers)
-
-    return {
-        'matched_features': matched_features,
-        'matched_paths': matched_paths,
-        'matched_customers': matched_customers,
-        'impact_count': impact_count
-    }
-
-
-def categorize_commit(commit: Dict[str, Any], watchlist: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Categorize a single commit and detect customer impacts.
-
-    Adds the following fields to the commit:
-    - category: str (feature, bugfix, breaking, performance, etc.)
-    - is_breaking: bool
-    - is_large: bool (>500 lines changed)
-    - customer_impacts: dict with matched features/paths/customers
-    - confidence: str (high, medium, low)
-
-    Args:
-        commit: Commit dict from git_history
-        watchlist: Customer watchlist dict
-
-    Returns:
-        Enriched commit dict with categorization fields
-    """
-    subject = commit.get('subject', '')
-    body = commit.get('body', '')
-    files_changed = commit.get('files_changed', [])
-
-    # Calculate total lines changed
-    total_insertions = sum(f.get('insertions', 0) for f in files_changed)
-    total_deletions = sum(f.get('deletions', 0) for f in files_changed)
-    total_lines_changed = total_insertions + total_deletions
-
-    # Parse conventional commit format
-    parsed = parse_conventional_commit(subject)
-
-    # Determine category
-    if parsed['is_conventional'] and parsed['category']:
-        category = parsed['category']
-        confidence = 'high'
-    else:
-        # Fallback to keyword matching
-        category = categorize_by_keywords(subject, body)
-        confidence = 'medium' if category != 'other' else 'low'
-
-    # Detect breaking changes
-    is_breaking = detect_breaking_change(subject, body)
-
-    # Override category if breaking change
-    if is_breaking:
-        category = 'breaking'
-        confidence = 'high'
-
-    # Check if large commit
-    is_large = total_lines_changed > 500
-
-    # Match customer impacts
-    file_paths = [f['path'] for f in files_changed]
-    customer_impacts = match_customer_impacts(subject, body, file_paths, watchlist)
-
-    # Add categorization fields to commit
-    enriched_commit = commit.copy()
-    enriched_commit.update({
-        'category': category,
-        'is_breaking': is_breaking,
-        'is_large': is_large,
-        'customer_impacts': customer_impacts,
-        'confidence': confidence,
-        'total_lines_changed': total_lines_changed,
-    })
-
-    return enriched_commit
-
-
-def categorize_commits(
-    commits: List[Dict[str, Any]],
-    watchlist: Dict[str, Any]
-) -> List[Dict[str, Any]]:
-    """
-    Categorize a list of commits.
-
-    Args:
-        commits: List of commit dicts from git_history
-        watchlist: Customer watchlist dict
-
-    Returns:
-        List of enriched commit dicts with categorization
-    """
-    categorized = []
-
-    for commit in commits:
-        enriched = categorize_commit(commit, watchlist)
-        categorized.append(enriched)
-
-    logger.info(f"Categorized {len(categorized)} commits")
-
-    # Log category distribution
-    category_counts = {}
-    for commit in categorized:
-        cat = commit['category']
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-
-    logger.debug(f"Category distribution: {category_counts}")
-
-    return categorized
-
-
-def get_category_summary(commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Get summary statistics for categorized commits.
-
-    Args:
-        commits: List of categorized commits
-
-    Returns:
-        dict with counts per category, breaking changes, customer impacts
-    """
-    category_counts = {}
-    breaking_count = 0
-    large_count = 0
-    customer_impact_commits = 0
-    total_customer_impacts = 0
-
-    for commit in commits:
-        # Count by category
-        category = commit.get('category', 'other')
-        category_counts[category] = category_counts.get(category, 0) + 1
-
-        # Count breaking changes
-        if commit.get('is_breaking'):
-            breaking_count += 1
-
-        # Count large commits
-        if commit.get('is_large'):
-            large_count += 1
-
-        # Count customer impacts
-        impacts = commit.get('customer_impacts', {})
-        impact_count = impacts.get('impact_count', 0)
-        if impact_count > 0:
-            customer_impact_commits += 1
-            total_customer_impacts += impact_count
-
-    return {
-        'total_commits': len(commits),
-        'category_counts': category_counts,
-        'breaking_changes': breaking_count,
-        'large_commits': large_count,
-        'customer_impact_commits': customer_impact_commits,
-        'total_customer_impacts': total_customer_impacts,
-    }
+"""
+Commit categorization and customer impact detection.
+
+This module analyzes commits to:
+- Categorize by type (feature, fix, breaking, etc.)
+- Detect breaking changes
+- Identify customer-impacting changes
+- Match against customer watchlist
+"""
+import functools
+import os
+import re
+import logging
+import sqlite3
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set
+
+from .classifier_cache import ClassifierCache, commit_cache_key, watchlist_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Commit count above which categorize_commits fans out to worker processes
+PARALLEL_THRESHOLD = 500
+
+# Shared read-only default for missing/None dict fields; never mutate it
+_EMPTY_DICT: Dict[str, Any] = {}
+
+
+# Conventional commit type mappings
+CONVENTIONAL_COMMIT_TYPES = {
+    'feat': 'feature',
+    'feature': 'feature',
+    'fix': 'bugfix',
+    'bug': 'bugfix',
+    'chore': 'chore',
+    'refactor': 'refactor',
+    'perf': 'performance',
+    'performance': 'performance',
+    'docs': 'documentation',
+    'doc': 'documentation',
+    'test': 'testing',
+    'tests': 'testing',
+    'style': 'chore',
+    'build': 'chore',
+    'ci': 'chore',
+}
+
+# Keyword heuristics for non-conventional commits
+KEYWORD_PATTERNS = {
+    'bugfix': ['fix', 'bug', 'patch', 'issue', 'resolve', 'correct'],
+    'feature': ['add', 'new', 'feature', 'implement', 'support'],
+    'performance': ['optimize', 'performance', 'faster', 'speed', 'improve'],
+    'documentation': ['doc', 'docs', 'readme', 'comment', 'documentation'],
+    'testing': ['test', 'tests', 'testing', 'spec', 'coverage'],
+    'refactor': ['refactor', 'restructure', 'reorganize', 'clean'],
+    'breaking': ['breaking', 'break', 'deprecated', 'remove', 'drop'],
+}
+
+# Conventional commit pattern: type(scope)!: description
+_CC_RE = re.compile(r'^(\w+)(?:\(([^)]+)\))?(!)?\s*:\s*(.+)$')
+
+# Body footers that flag a breaking change: "BREAKING CHANGE:", "BREAKING:"
+# or "BREAKING-CHANGE:", in any case, found in a single regex scan
+_BREAKING_FOOTER_RE = re.compile(r'breaking(?: change|-change)?:', re.IGNORECASE)
+
+# Keyword categories in priority order. 'breaking' is never used as a primary
+# category, so it is left out.
+_KEYWORD_CATEGORIES = tuple(c for c in KEYWORD_PATTERNS if c != 'breaking')
+_CATEGORY_RANK = {category: rank for rank, category in enumerate(_KEYWORD_CATEGORIES)}
+
+# All keyword categories in one alternation with a named group per category,
+# so a commit is classified in a single scan of its text. Keywords match whole
+# words (plus simple inflections like "fixes"/"added") so "add" doesn't hit
+# "address". Groups are listed in priority order, so at any position the
+# higher-priority category wins.
+_KEYWORD_RE = re.compile(
+    '|'.join(
+        f'(?P<{category}>\\b(?:'
+        + '|'.join(re.escape(k) for k in sorted(KEYWORD_PATTERNS[category], key=len, reverse=True))
+        + r')(?:s|es|d|ed|ing)?\b)'
+        for category in _KEYWORD_CATEGORIES
+    ),
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_subject(subject: str) -> Dict[str, Any]:
+    """
+    Cached conventional commit parse shared by all callers.
+
+    Bot-generated subjects (dependency bumps, merges) repeat often, and
+    categorize_commit needs the parse for both categorization and breaking
+    change detection. The returned dict is shared: callers must not mutate it.
+    """
+    # Pattern: type(scope)!: description
+    # or: type!: description
+    # or: type: description
+    match = _CC_RE.match(subject.strip())
+
+    if match:
+        commit_type = match.group(1).lower()
+        scope = match.group(2) or None
+        breaking_marker = match.group(3) == '!'
+        description = match.group(4).strip()
+
+        # Map to category
+        category = CONVENTIONAL_COMMIT_TYPES.get(commit_type, 'other')
+
+        return {
+            'is_conventional': True,
+            'type': commit_type,
+            'scope': scope,
+            'breaking_marker': breaking_marker,
+            'description': description,
+            'category': category
+        }
+
+    return {
+        'is_conventional': False,
+        'type': None,
+        'scope': None,
+        'breaking_marker': False,
+        'description': subject,
+        'category': None
+    }
+
+
+def parse_conventional_commit(subject: str) -> Dict[str, Any]:
+    """
+    Parse conventional commit format: type(scope)!: description
+
+    Args:
+        subject: Commit subject line
+
+    Returns:
+        dict with type, scope, breaking, description
+    """
+    return dict(_parse_subject(subject))
+
+
+def _is_breaking(parsed: Dict[str, Any], body: str) -> bool:
+    """Check an already-parsed subject and the raw body for breaking markers."""
+    # Check for ! in subject (conventional commit marker)
+    if parsed['breaking_marker']:
+        return True
+
+    # Check for "BREAKING CHANGE:" in body
+    return _BREAKING_FOOTER_RE.search(body) is not None
+
+
+def detect_breaking_change(subject: str, body: str) -> bool:
+    """
+    Detect if commit is a breaking change.
+
+    Args:
+        subject: Commit subject
+        body: Commit body
+
+    Returns:
+        True if breaking change detected
+    """
+    return _is_breaking(_parse_subject(subject), body)
+
+
+def categorize_by_keywords(subject: str, body: str) -> str:
+    """
+    Categorize commit using keyword heuristics (fallback).
+
+    Args:
+        subject: Commit subject
+        body: Commit body
+
+    Returns:
+        Category string
+    """
+    return _categorize_text(subject + ' ' + body)
+
+
+def _categorize_text(text: str) -> str:
+    """Keyword-categorize combined subject/body text (any case)."""
+    # Single scan; keep the highest-priority category seen, stopping early
+    # once nothing can outrank it
+    best_rank = len(_KEYWORD_CATEGORIES)
+    for match in _KEYWORD_RE.finditer(text):
+        rank = _CATEGORY_RANK[match.lastgroup]
+        if rank < best_rank:
+            best_rank = rank
+            if rank == 0:
+                break
+
+    if best_rank == len(_KEYWORD_CATEGORIES):
+        return 'other'
+    return _KEYWORD_CATEGORIES[best_rank]
+
+
+def _build_term_matcher(terms: List[str]) -> Dict[str, Any]:
+    """
+    Precompile watchlist terms for case-insensitive substring matching.
+
+    All terms are folded into one regex alternation so a commit that mentions
+    none of them is rejected in a single C-level scan. Commits that do hit
+    are confirmed term by term, which keeps overlapping terms (e.g. "payment"
+    and "payment-processing") reported exactly as before.
+
+    Args:
+        terms: Watchlist terms (features or customer names)
+
+    Returns:
+        dict with the compiled prefilter ('pattern') and the
+        (lowercased, original) term pairs ('pairs')
+    """
+    terms_lower = {term.lower(): term for term in terms}
+    pattern = None
+    if terms_lower:
+        pattern = re.compile('|'.join(
+            re.escape(term) for term in sorted(terms_lower, key=len, reverse=True)
+        ))
+
+    return {
+        'pattern': pattern,
+        'pairs': tuple(terms_lower.items()),
+    }
+
+
+def _match_terms(text_lower: str, matcher: Dict[str, Any]) -> List[str]:
+    """Return original terms from a prepared matcher found in lowercased text."""
+    pattern = matcher['pattern']
+    if pattern is None or not pattern.search(text_lower):
+        return []
+    return [term for term_lower, term in matcher['pairs'] if term_lower in text_lower]
+
+
+def _prepare_watchlist(watchlist: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the per-watchlist matchers once so they can be reused for every commit.
+
+    The watchlist is constant across a categorize_commits call, so lowercasing
+    and compiling its terms per commit is pure redundant work.
+
+    Args:
+        watchlist: Customer watchlist dict
+
+    Returns:
+        dict with 'features' and 'customers' term matchers and a
+        'high_risk_paths' tuple
+    """
+    return {
+        'features': _build_term_matcher(watchlist.get('watched_features', [])),
+        'customers': _build_term_matcher(watchlist.get('critical_customers', [])),
+        'high_risk_paths': tuple(watchlist.get('high_risk_paths', [])),
+    }
+
+
+def _match_customer_impacts_prepared(
+    text_lower: str,
+    file_paths: List[str],
+    prepared_watchlist: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Match lowercased commit text and file paths against a prepared watchlist.
+
+    Args:
+        text_lower: Lowercased subject and body
+        file_paths: List of changed file paths
+        prepared_watchlist: Matchers from _prepare_watchlist
+
+    Returns:
+        dict with matched_features, matched_paths, impact_count
+    """
+    matched_features = _match_terms(text_lower, prepared_watchlist['features'])
+
+    # Match high-risk paths - startswith(tuple) tests every prefix in one C call,
+    # so the per-prefix loop only runs for files that are known to match
+    high_risk_paths = prepared_watchlist['high_risk_paths']
+    matched_paths_set = set()
+    if high_risk_paths:
+        for changed_file in file_paths:
+            if changed_file.startswith(high_risk_paths):
+                matched_paths_set.update(
+                    risk_path for risk_path in high_risk_paths
+                    if changed_file.startswith(risk_path)
+                )
+    matched_paths = sorted(matched_paths_set)
+
+    matched_customers = _match_terms(text_lower, prepared_watchlist['customers'])
+
+    impact_count = len(matched_features) + len(matched_paths) + len(matched_customers)
+
+    return {
+        'matched_features': matched_features,
+        'matched_paths': matched_paths,
+        'matched_customers': matched_customers,
+        'impact_count': impact_count
+    }
+
+
+def match_customer_impacts(
+    subject: str,
+    body: str,
+    file_paths: List[str],
+    watchlist: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Match commit against customer watchlist.
+
+    Args:
+        subject: Commit subject
+        body: Commit body
+        file_paths: List of changed file paths
+        watchlist: Customer watchlist dict
+
+    Returns:
+        dict with matched_features, matched_paths, impact_count
+    """
+    return _match_customer_impacts_prepared(
+        (subject + ' ' + body).lower(),
+        file_paths,
+        _prepare_watchlist(watchlist)
+    )
+
+
+def categorize_commit(
+    commit: Dict[str, Any],
+    watchlist: Dict[str, Any],
+    prepared_watchlist: Optional[Dict[str, Any]] = None,
+    in_place: bool = False
+) -> Dict[str, Any]:
+    """
+    Categorize a single commit and detect customer impacts.
+
+    Adds the following fields to the commit:
+    - category: str (feature, bugfix, breaking, performance, etc.)
+    - is_breaking: bool
+    - is_large: bool (>500 lines changed)
+    - customer_impacts: dict with matched features/paths/customers
+    - has_customer_impact: bool (customer_impacts matched anything)
+    - confidence: str (high, medium, low)
+    - total_lines_changed: int
+    - files_changed_count: int
+
+    Args:
+        commit: Commit dict from git_history
+        watchlist: Customer watchlist dict
+        prepared_watchlist: Optional matchers from _prepare_watchlist(watchlist)
+        in_place: Add the fields to `commit` itself instead of a copy (use when
+            the caller no longer needs the raw commit)
+
+    Returns:
+        Enriched commit dict with categorization fields
+    """
+    subject = commit.get('subject', '')
+    body = commit.get('body', '')
+    files_changed = commit.get('files_changed', ())
+
+    # Calculate total lines changed and collect paths in one pass
+    total_lines_changed = 0
+    file_paths = []
+    for f in files_changed:
+        total_lines_changed += f.get('insertions', 0) + f.get('deletions', 0)
+        file_paths.append(f['path'])
+
+    # Parse conventional commit format (cached; shared with breaking detection)
+    parsed = _parse_subject(subject)
+
+    # Combined text, built and lowercased once for keyword and watchlist matching
+    text_lower = (subject + ' ' + body).lower()
+
+    # Detect breaking changes first: they override every other signal, so
+    # neither the conventional type nor the keyword scan is needed for them
+    is_breaking = _is_breaking(parsed, body)
+
+    # Determine category
+    if is_breaking:
+        category = 'breaking'
+        confidence = 'high'
+    elif parsed['is_conventional'] and parsed['category']:
+        category = parsed['category']
+        confidence = 'high'
+    else:
+        # Fallback to keyword matching
+        category = _categorize_text(text_lower)
+        confidence = 'medium' if category != 'other' else 'low'
+
+    # Check if large commit
+    is_large = total_lines_changed > 500
+
+    # Match customer impacts
+    if prepared_watchlist is None:
+        prepared_watchlist = _prepare_watchlist(watchlist)
+    customer_impacts = _match_customer_impacts_prepared(
+        text_lower, file_paths, prepared_watchlist
+    )
+
+    # Add categorization fields to commit
+    enriched_commit = commit if in_place else commit.copy()
+    enriched_commit.update({
+        'category': category,
+        'is_breaking': is_breaking,
+        'is_large': is_large,
+        'customer_impacts': customer_impacts,
+        'has_customer_impact': customer_impacts['impact_count'] > 0,
+        'confidence': confidence,
+        'total_lines_changed': total_lines_changed,
+        'files_changed_count': len(file_paths),
+    })
+
+    return enriched_commit
+
+
+def iter_categorized_commits(
+    commits: Iterable[Dict[str, Any]],
+    watchlist: Dict[str, Any],
+    in_place: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily categorize commits one at a time.
+
+    Unlike categorize_commits this never materializes the enriched list, so
+    it can be chained straight into aggregation. Combined with in_place=True
+    the peak memory is the input commits alone.
+
+    Args:
+        commits: Iterable of commit dicts from git_history
+        watchlist: Customer watchlist dict
+        in_place: Enrich the input commit dicts instead of copying them
+
+    Yields:
+        Enriched commit dicts with categorization
+    """
+    prepared_watchlist = _prepare_watchlist(watchlist)
+    for commit in commits:
+        yield categorize_commit(commit, watchlist, prepared_watchlist, in_place)
+
+
+def has_customer_impact(commit: Dict[str, Any]) -> bool:
+    """
+    Whether a categorized commit matched anything on the customer watchlist.
+
+    Uses the precomputed 'has_customer_impact' flag set by categorize_commit,
+    falling back to the impact count for commits enriched elsewhere.
+    """
+    flag = commit.get('has_customer_impact')
+    if flag is None:
+        flag = (commit.get('customer_impacts') or _EMPTY_DICT).get('impact_count', 0) > 0
+    return flag
+
+
+def _categorize_chunk(
+    commits: List[Dict[str, Any]],
+    watchlist: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Categorize one batch of commits (runs in a worker process)."""
+    return list(iter_categorized_commits(commits, watchlist))
+
+
+def _categorize_parallel(
+    commits: List[Dict[str, Any]],
+    watchlist: Dict[str, Any]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Categorize commits across worker processes, one contiguous batch per CPU.
+
+    Batching keeps pickling overhead to one round trip per worker instead of
+    one per commit. Commit order is preserved.
+
+    Args:
+        commits: List of commit dicts from git_history
+        watchlist: Customer watchlist dict
+
+    Returns:
+        List of enriched commits, or None if worker processes are unavailable
+    """
+    workers = min(os.cpu_count() or 1, len(commits))
+    if workers < 2:
+        return None
+
+    chunk_size = -(-len(commits) // workers)
+    chunks = [commits[i:i + chunk_size] for i in range(0, len(commits), chunk_size)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            results = executor.map(_categorize_chunk, chunks, repeat(watchlist))
+            return [commit for chunk in results for commit in chunk]
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        logger.warning(f"Parallel categorization unavailable, falling back to serial: {e}")
+        return None
+
+
+def categorize_commits(
+    commits: List[Dict[str, Any]],
+    watchlist: Dict[str, Any],
+    cache_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Categorize a list of commits.
+
+    Args:
+        commits: List of commit dicts from git_history
+        watchlist: Customer watchlist dict
+        cache_dir: Optional directory for the on-disk classification cache
+            (e.g. "~/.cache/release-notes-server"). Commits classified by an
+            earlier run with the same watchlist are reused instead of
+            re-classified.
+
+    Returns:
+        List of enriched commit dicts with categorization
+    """
+    cache = None
+    cached = {}
+    keys = []
+    if cache_dir:
+        keys = [commit_cache_key(commit) if commit.get('sha') else None for commit in commits]
+        try:
+            cache = ClassifierCache(cache_dir)
+            fingerprint = watchlist_fingerprint(watchlist)
+            cached = cache.get_many([key for key in keys if key], fingerprint)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Classification cache unavailable, continuing without it: {e}")
+            if cache is not None:
+                cache.close()
+            cache = None
+            cached = {}
+
+    if cached:
+        pending = [commit for commit, key in zip(commits, keys) if key not in cached]
+    else:
+        pending = commits
+
+    categorized = None
+
+    # Large ranges are embarrassingly parallel: commits are independent and
+    # the watchlist is read-only
+    if len(pending) > PARALLEL_THRESHOLD:
+        categorized = _categorize_parallel(pending, watchlist)
+
+    if categorized is None:
+        categorized = _categorize_chunk(pending, watchlist)
+
+    if cache is not None:
+        try:
+            cache.put_many(categorized, fingerprint)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update classification cache: {e}")
+        finally:
+            cache.close()
+
+    if cached:
+        # Merge cache hits back in, preserving the input order
+        fresh = iter(categorized)
+        categorized = []
+        for commit, key in zip(commits, keys):
+            fields = cached.get(key)
+            if fields is None:
+                categorized.append(next(fresh))
+            else:
+                enriched = commit.copy()
+                enriched.update(fields)
+                categorized.append(enriched)
+        logger.debug(f"Reused {len(cached)} cached classifications")
+
+    logger.info(f"Categorized {len(categorized)} commits")
+
+    # Log category distribution (only walk the commits again if it's emitted)
+    if logger.isEnabledFor(logging.DEBUG):
+        category_counts = Counter(commit['category'] for commit in categorized)
+        logger.debug(f"Category distribution: {dict(category_counts)}")
+
+    return categorized
+
+
+def get_category_summary(commits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Get summary statistics for categorized commits.
+
+    Args:
+        commits: List of categorized commits
+
+    Returns:
+        dict with counts per category, breaking changes, customer impacts
+    """
+    category_counts = Counter()
+    breaking_count = 0
+    large_count = 0
+    customer_impact_commits = 0
+    total_customer_impacts = 0
+
+    for commit in commits:
+        # Count by category
+        category_counts[commit.get('category', 'other')] += 1
+
+        # Count breaking changes
+        if commit.get('is_breaking'):
+            breaking_count += 1
+
+        # Count large commits
+        if commit.get('is_large'):
+            large_count += 1
+
+        # Count customer impacts
+        if has_customer_impact(commit):
+            customer_impact_commits += 1
+            total_customer_impacts += commit['customer_impacts']['impact_count']
+
+    return {
+        'total_commits': len(commits),
+        'category_counts': dict(category_counts),
+        'breaking_changes': breaking_count,
+        'large_commits': large_count,
+        'customer_impact_commits': customer_impact_commits,
+        'total_customer_impacts': total_customer_impacts,
+    }
@@ -1,170 +1,213 @@
-"""
-File I/O utilities for loading JSON configuration files.
-
-Implements graceful degradation:
-- Returns None or defaults if files don't exist
-- Validates JSON structure
-- Provides helpful error messages
-"""
-import json
-import logging
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-from .errors import InvalidJSONFileError
-
-logger = logging.getLogger(__name__)
-
-
-def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
-    """
-    Load and parse a JSON file with error handling.
-
-    Args:
-        file_path: Path to JSON file
-
-    Returns:
-        Parsed JSON dict, or None if file doesn't exist
-
-    Raises:
-        InvalidJSONFileError: If file exists but contains invalid JSON
-    """
-    path = Path(file_path)
-
-    # Graceful degradation: return None if file doesn't exist
-    if not path.exists():
-        logger.info(f"JSON file not found: {file_path} (will use defaults)")
-        return None
-
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        logger.info(f"Loaded JSON file: {file_path}")
-        return data
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in {file_path}: {e}")
-        raise InvalidJSONFileError(file_path, str(e))
-    except Exception as e:
-        logger.error(f"Error reading {file_path}: {e}")
-        raise InvalidJSONFileError(file_path, str(e))
-
-
-def load_ci_report(report_path: str) -> Optional[Dict[str, Any]]:
-    """
-    Load and validate CI report JSON file.
-
-    Expected structure:
-    {
-        "test_summary": {"total", "passed", "failed", "skipped"},
-        "coverage": {"line_percent", "branch_percent"},
-        "build_status": "success|failed|unstable",
-        ...
-    }
-
-    Args:
-        report_path: Path to CI report JSON file
-
-    Returns:
-        CI report dict, or None if file doesn't exist
-
-    Raises:
-        InvalidJSONFileError: If file exists but is invalid
-    """
-    data = load_json_file(report_path)
-
-    if data is None:
-        return None
-
-    # Basic validation - check for expected top-level keys
-    expected_keys = {'test_summary', 'coverage', 'build_status'}
-    missing_keys = expected_keys - set(data.keys())
-
-    if missing_keys:
-        logger.warning(
-            f"CI report missing recommended keys: {missing_keys}. "
-            f"Report may be incomplete."
-        )
-
-    # Validate test_summary structure
-    if 'test_summary' in data:
-        test_summary = data['test_summary']
-        required_fields = {'total', 'passed', 'failed'}
-        missing_fields = required_fields - set(test_summary.keys())
-        if missing_fields:
-            logger.warning(f"test_summary missing fields: {missing_fields}")
-
-    # Validate coverage structure
-    if 'coverage' in data:
-        coverage = data['coverage']
-        if 'line_percent' not in coverage:
-            logger.warning("coverage missing line_percent")
-
-    return data
-
-
-def load_customer_watchlist(watchlist_path: str) -> Dict[str, Any]:
-    """
-    Load customer watchlist JSON file with defaults.
-
-    Expected structure:
-    {
-        "critical_customers": ["customer-id", ...],
-        "watched_features": ["feature-name", ...],
-        "high_risk_paths": ["path/prefix/", ...],
-        ...
-    }
-
-    Args:
-        watchlist_path: Path to watchlist JSON file
-
-    Returns:
-        Watchlist dict (uses defaults if file doesn't exist)
-
-    Raises:
-        InvalidJSONFileError: If file exists but is invalid
-    """
-    # Default watchlist structure
-    defaults = {
-        "critical_customers": [],
-        "watched_features": [],
-        "breaking_change_keywords": [
-            "BREAKING",
-            "BREAKING CHANGE",
-            "deprecated",
-            "removed",
-            "drop support",
-            "incompatible"
-        ],
-        "high_risk_paths": [],
-        "migration_patterns": [
-            "migrations/",
-            "alembic/versions/",
-            "db/migrate/"
-        ]
-    }
-
-    data = load_json_file(watchlist_path)
-
-    if data is None:
-        logger.info("Using default customer watchlist (no file found)")
-        return defaults
-
-    # Merge with defaults (file values override defaults)
-    merged = defaults.copy()
-    merged.update(data)
-
-    # Validate list fields
-    list_fields = [
-        'critical_customers',
-        'watched_features',
-        'breaking_change_keywords',
-        'high_risk_paths',
-        'migration_patterns'
-    ]
-
-    for field in list_fields:
-        if field in merged and not isinstance(merged[field], list):
-            logger.warning(f"watchlist.{field} should be a list, got {type(merged[field])}")
-            merged[field] = []
-
-    return merged
+"""
+File I/O utilities for loading JSON configuration files.
+
+Implements graceful degradation:
+- Returns None or defaults if files don't exist
+- Validates JSON structure
+- Provides helpful error messages
+"""
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+from .errors import InvalidJSONFileError
+
+logger = logging.getLogger(__name__)
+
+# CI report keys checked by load_ci_report
+CI_REPORT_EXPECTED_KEYS = frozenset({'test_summary', 'coverage', 'build_status'})
+TEST_SUMMARY_REQUIRED_FIELDS = frozenset({'total', 'passed', 'failed'})
+
+# Parsed JSON files keyed by path, with the (mtime_ns, size, inode) they
+# were parsed at; a matching stat means the file is unchanged
+_json_cache: Dict[str, Tuple[int, int, int, Any]] = {}
+
+# Watchlist fields that must be lists
+WATCHLIST_LIST_FIELDS = (
+    'critical_customers',
+    'watched_features',
+    'breaking_change_keywords',
+    'high_risk_paths',
+    'migration_patterns'
+)
+
+# Watchlist used when no file exists, and the base a file is merged over.
+# Frozen so the shared copy can't be mutated through a returned watchlist
+DEFAULT_WATCHLIST = MappingProxyType({
+    "critical_customers": (),
+    "watched_features": (),
+    "breaking_change_keywords": (
+        "BREAKING",
+        "BREAKING CHANGE",
+        "deprecated",
+        "removed",
+        "drop support",
+        "incompatible"
+    ),
+    "high_risk_paths": (),
+    "migration_patterns": (
+        "migrations/",
+        "alembic/versions/",
+        "db/migrate/"
+    )
+})
+
+
+def clear_json_cache() -> None:
+    """Forget all parsed JSON files so the next load re-reads them."""
+    _json_cache.clear()
+
+
+def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load and parse a JSON file with error handling.
+
+    Unchanged files (same mtime, size and inode) are served from a cache
+    after a single stat. The cached object is shared between calls, so
+    callers must not mutate it.
+
+    Args:
+        file_path: Path to JSON file
+
+    Returns:
+        Parsed JSON dict, or None if file doesn't exist
+
+    Raises:
+        InvalidJSONFileError: If file exists but contains invalid JSON
+    """
+    path = Path(file_path)
+    cache_key = str(path)
+
+    try:
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+        cached = _json_cache.get(cache_key)
+        if cached is not None and cached[:3] == signature:
+            logger.debug(f"Using cached JSON file: {file_path}")
+            return cached[3]
+
+        # Parse the raw bytes in one call: json.loads detects the UTF
+        # encoding itself, so no text-mode file layer is needed. The entry
+        # is keyed by an fstat of the opened file, so a file replaced after
+        # the stat above can't be cached under the old signature
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        data = json.loads(raw)
+        _json_cache[cache_key] = (st.st_mtime_ns, st.st_size, st.st_ino, data)
+        logger.info(f"Loaded JSON file: {file_path}")
+        return data
+    except FileNotFoundError:
+        _json_cache.pop(cache_key, None)
+        # Graceful degradation: return None if file doesn't exist
+        logger.info(f"JSON file not found: {file_path} (will use defaults)")
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.error(f"Invalid JSON in {file_path}: {e}")
+        raise InvalidJSONFileError(file_path, str(e))
+    except Exception as e:
+        logger.error(f"Error reading {file_path}: {e}")
+        raise InvalidJSONFileError(file_path, str(e))
+
+
+def load_ci_report(report_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load and validate CI report JSON file.
+
+    Expected structure:
+    {
+        "test_summary": {"total", "passed", "failed", "skipped"},
+        "coverage": {"line_percent", "branch_percent"},
+        "build_status": "success|failed|unstable",
+        ...
+    }
+
+    Args:
+        report_path: Path to CI report JSON file
+
+    Returns:
+        CI report dict, or None if file doesn't exist
+
+    Raises:
+        InvalidJSONFileError: If file exists but is invalid
+    """
+    data = load_json_file(report_path)
+
+    if data is None:
+        return None
+
+    # Basic validation - check for expected top-level keys
+    # (dict views support set operations directly, no key copy needed)
+    missing_keys = CI_REPORT_EXPECTED_KEYS - data.keys()
+
+    if missing_keys:
+        logger.warning(
+            f"CI report missing recommended keys: {missing_keys}. "
+            f"Report may be incomplete."
+        )
+
+    # Validate test_summary structure
+    if 'test_summary' in data:
+        test_summary = data['test_summary']
+        missing_fields = TEST_SUMMARY_REQUIRED_FIELDS - test_summary.keys()
+        if missing_fields:
+            logger.warning(f"test_summary missing fields: {missing_fields}")
+
+    # Validate coverage structure
+    if 'coverage' in data:
+        coverage = data['coverage']
+        if 'line_percent' not in coverage:
+            logger.warning("coverage missing line_percent")
+
+    return data
+
+
+def _default_watchlist() -> Dict[str, Any]:
+    """Build a caller-owned watchlist dict (with list values) from DEFAULT_WATCHLIST."""
+    return {field: list(values) for field, values in DEFAULT_WATCHLIST.items()}
+
+
+def load_customer_watchlist(watchlist_path: str) -> Dict[str, Any]:
+    """
+    Load customer watchlist JSON file with defaults.
+
+    Expected structure:
+    {
+        "critical_customers": ["customer-id", ...],
+        "watched_features": ["feature-name", ...],
+        "high_risk_paths": ["path/prefix/", ...],
+        ...
+    }
+
+    Args:
+        watchlist_path: Path to watchlist JSON file
+
+    Returns:
+        Watchlist dict (uses defaults if file doesn't exist)
+
+    Raises:
+        InvalidJSONFileError: If file exists but is invalid
+    """
+    data = load_json_file(watchlist_path)
+
+    if data is None:
+        logger.info("Using default customer watchlist (no file found)")
+        return _default_watchlist()
+
+    # Merge with defaults (file values override defaults). The parsed file
+    # is cached and shared, so merge a private copy of it
+    merged = _default_watchlist()
+    merged.update(copy.deepcopy(data))
+
+    # Validate list fields
+    for field in WATCHLIST_LIST_FIELDS:
+        if field in merged and not isinstance(merged[field], list):
+            logger.warning(f"watchlist.{field} should be a list, got {type(merged[field])}")
+            merged[field] = []
+
+    return merged
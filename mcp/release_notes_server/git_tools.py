@@ -1,543 +1,1039 @@
-"""
-Git operations and commit parsing for release notes.
-
-This module provides low-level git operations using subprocess (stdlib only).
-All functions assume they're running in a git repository context.
-"""
-import subprocess
-import os
-import re
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-import logging
-
-from .errors import (
-    GitRepoNotFoundError,
-    InvalidRefError,
-    EmptyCommitRangeError,
-    CommitLimitExceededError,
-    GitOperationTimeoutError,
-    InternalError,
-)
-
-logger = logging.getLogger(__name__)
-
-# Constants
-DEFAULT_MAX_COMMITS = 200
-GIT_TIMEOUT_SECONDS = 30
-COMMIT_DELIMITER = "|||END_COMMIT|||"
-FIELD_DELIMITER = "|||"
-
-
-def is_git_repository(path: str = ".") -> bool:
-    """
-    Check if the given path is inside a git repository.
-
-    Args:
-        path: Path to check (default: current directory)
-
-    Returns:
-        True if inside a git repository, False otherwise
-    """
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
-            cwd=path,
-            capture_output=True,
-            timeout=5,
-            check=True,
-            text=True
-        )
-        return result.returncode == 0
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
-        return False
-
-
-def resolve_ref(ref: str, cwd: str = ".") -> str:
-    """
-    Resolve a git ref (tag, branch, SHA) to a full SHA.
-
-    Args:
-        ref: Git reference (tag, branch, or SHA)
-        cwd: Working directory (default: current directory)
-
-    Returns:
-        Full SHA hash
-
-    Raises:
-        InvalidRefError: If ref doesn't exist
-        GitRepoNotFoundError: If not in a git repository
-    """
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--verify", ref],
-            cwd=cwd,
-            capture_output=True,
-            timeout=5,
-            check=True,
-            text=True
-        )
-        sha = result.stdout.strip()
-        logger.debug(f"Resolved {ref} -> {sha}")
-        return sha
-
-    except subprocess.TimeoutExpired:
-        raise GitOperationTimeoutError(5)
-
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr.strip().lower()
-
-        if "not a git repository" in stderr:
-            raise GitRepoNotFoundError(cwd)
-        elif "unknown revision" in stderr or "bad revision" in stderr:
-            raise InvalidRefError(ref)
-        else:
-            raise InvalidRefError(ref)
-
-    except FileNotFoundError:
-        raise InternalError("git command not found. Is git installed?")
-
-
-def get_commit_count(from_ref: str, to_ref: str, cwd: str = ".") -> int:
-    """
-    Count commits between two refs.
-
-    Args:
-        from_ref: Starting ref
-        to_ref: Ending ref
-        cwd: Working directory
-
-    Returns:
-        Number of commits in range from_ref..to_ref
-
-    Raises:
-        InvalidRefError: If refs don't exist
-        GitOperationTimeoutError: If operation times out
-    """
-    try:
-        result = subprocess.run(
-            ["git", "rev-list", "--count", "--no-merges", f"{from_ref}..{to_ref}"],
-            cwd=cwd,
-            capture_output=True,
-            timeout=GIT_TIMEOUT_SECONDS,
-            check=True,
-            text=True
-        )
-        count = int(result.stdout.strip())
-        logger.debug(f"Commit count {from_ref}..{to_ref}: {count}")
-        return count
-
-    except subprocess.TimeoutExpired:
-        raise GitOperationTimeoutError(GIT_TIMEOUT_SECONDS)
-
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr.strip().lower()
-
-        if "unknown revision" in stderr or "bad revision" in stderr:
-            # Try to determine which ref is invalid
-            try:
-                resolve_ref(from_ref, cwd)
-                raise InvalidRefError(to_ref)
-            except InvalidRefError:
-                raise InvalidRefError(from_ref)
-        else:
-            raise InternalError(f"git rev-list failed: {e.stderr}")
-
-    except ValueError as e:
-        raise InternalError(f"Failed to parse commit count: {e}")
-
-
-def run_git_log(
-    from_ref: str,
-    to_ref: str,
-    include_diffs: bool = False,
-    max_commits: int = DEFAULT_MAX_COMMITS,
-    cwd: str = ".",
-    timeout: int = GIT_TIMEOUT_SECONDS
-) -> str:
-    """
-    Run git log with custom format to get commit history.
-
-    Args:
-        from_ref: Starting ref
-        to_ref: Ending ref
-        include_diffs: Include full patch diffs (expensive)
-        max_commits: Maximum commits to return
-        cwd: Working directory
-        timeout: Timeout in seconds
-
-    Returns:
-        Raw git log output
-
-    Raises:
-        InvalidRefError: If refs don't exist
-        GitOperationTimeoutError: If operation times out
-        InternalError: If git command fails
-    """
-    # Build git log command
-    # Format: SHA|||author|||email|||timestamp|||subject|||body|||END_COMMIT
-    log_format = f"%H{FIELD_DELIMITER}%an{FIELD_DELIMITER}%ae{FIELD_DELIMITER}%at{FIELD_DELIMITER}%s{FIELD_DELIMITER}%b{FIELD_DELIMITER}{COMMIT_DELIMITER}"
-
-    cmd = [
-        "git", "log",
-        "--no-merges",
-        f"--format={log_format}",
-        "--numstat",  # Show file stats
-        f"-{max_commits}",  # Limit commits
-        f"{from_ref}..{to_ref}"
-    ]
-
-    # Add patch diffs if requested
-    if include_diffs:
-        cmd.insert(2, "-p")  # Add patch output
-
-    logger.debug(f"Running: {' '.join(cmd)}")
-
-    try:
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            timeout=timeout,
-            check=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace'  # Replace invalid UTF-8 with replacement char
-        )
-
-        return result.stdout
-
-    except subprocess.TimeoutExpired:
-        raise GitOperationTimeoutError(timeout)
-
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr.strip().lower()
-
-        if "unknown revision" in stderr or "bad revision" in stderr:
-            # Try to determine which ref is invalid
-            try:
-                resolve_ref(from_ref, cwd)
-                raise InvalidRefError(to_ref)
-            except InvalidRefError:
-                raise InvalidRefError(from_ref)
-        else:
-            raise InternalError(f"git log failed: {e.stderr}")
-
-    except FileNotFoundError:
-        raise InternalError("git command not found. Is git installed?")
-
-
-def parse_git_log_output(raw_output: str, from_ref: str, to_ref: str) -> Dict[str, Any]:
-    """
-    Parse git log output into structured JSON.
-
-    Args:
-        raw_output: Raw output from git log
-        from_ref: Original from_ref (for metadata)
-        to_ref: Original to_ref (for metadata)
-
-    Returns:
-        Dictionary with commits, stats, and warnings
-
-    Format:
-        {
-            "commits": [
-                {
-                    "sha": "...",
-                    "author": "...",
-                    "email": "...",
-                    "timestamp": 1234567890,
-                    "date": "2024-01-15T10:30:00Z",
-                    "subject": "...",
-                    "body": "...",
-                    "files_changed": [
-                        {
-                            "path": "src/file.py",
-                            "insertions": 50,
-                            "deletions": 10,
-                            "status": "modified"
-                        }
-                    ]
-                }
-            ],
-            "stats": {
-                "total_commits": 15,
-                "total_files_changed": 42,
-                "total_insertions": 1200,
-                "total_deletions": 300,
-                "authors": ["Jane", "John"],
-                "date_range": {...}
-            }
-        }
-    """
-    if not raw_output.strip():
-        # No commits in range
-        return {
-            "commits": [],
-            "stats": {
-                "total_commits": 0,
-                "total_files_changed": 0,
-                "total_insertions": 0,
-                "total_deletions": 0,
-                "authors": [],
-                "date_range": None
-            }
-        }
-
-    commits = []
-    authors_set = set()
-    total_insertions = 0
-    total_deletions = 0
-    files_set = set()
-    timestamps = []
-
-    # Split by commit delimiter
-    commit_blocks = raw_output.split(COMMIT_DELIMITER)
-
-    # First pass: extract all commit metadata
-    commit_metadata_list = []
-
-    for block_idx, block in enumerate(commit_blocks):
-        block = block.strip()
-        if not block:
-            continue
-
-        # Split block into lines
-        lines = block.split('\n')
-
-        # Find commit metadata line (contains FIELD_DELIMITER)
-        metadata_line = None
-        for line in lines:
-            if line.strip() and FIELD_DELIMITER in line and line.count(FIELD_DELIMITER) >= 5:
-                metadata_line = line
-                break
-
-        if metadata_line is None:
-            # No metadata in this block
-            continue
-
-        # Parse metadata
-        parts = metadata_line.split(FIELD_DELIMITER)
-        if len(parts) < 6:
-            logger.warning(f"Invalid commit metadata: {metadata_line[:100]}")
-            continue
-
-        sha = parts[0].strip()
-        author = parts[1].strip()
-        email = parts[2].strip()
-        timestamp_str = parts[3].strip()
-        subject = parts[4].strip()
-        body = parts[5].strip() if len(parts) > 5 else ""
-
-        # Convert timestamp
-        try:
-            timestamp = int(timestamp_str)
-            date_iso = datetime.utcfromtimestamp(timestamp).strftime('%Y-%m-%dT%H:%M:%SZ')
-            timestamps.append(timestamp)
-        except (ValueError, OSError):
-            logger.warning(f"Invalid timestamp: {timestamp_str}")
-            timestamp = 0
-            date_iso = "1970-01-01T00:00:00Z"
-
-        # Track author
-        authors_set.add(author)
-
-        commit_metadata_list.append({
-            "sha": sha,
-            "author": author,
-            "email": email,
-            "timestamp": timestamp,
-            "date": date_iso,
-            "subject": subject,
-            "body": body,
-            "block_idx": block_idx
-        })
-
-    # Second pass: extract numstat data and associate with commits
-    for i, commit_meta in enumerate(commit_metadata_list):
-        files_changed = []
-        commit_insertions = 0
-        commit_deletions = 0
-
-        # Numstat for commit i is in block i+1 (after the delimiter)
-        # It appears before the next commit's metadata
-        numstat_block_idx = commit_meta["block_idx"] + 1
-
-        if numstat_block_idx < len(commit_blocks):
-            block = commit_blocks[numstat_block_idx].strip()
-            lines = block.split('\n')
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Stop if we hit the next commit's metadata
-                if FIELD_DELIMITER in line and line.count(FIELD_DELIMITER) >= 5:
-                    break
-
-                # numstat format: insertions\tdeletions\tfilename
-                # Note: Binary files show as "-\t-\tfilename"
-                match = re.match(r'^(\d+|-)\s+(\d+|-)\s+(.+)$', line)
-                if not match:
-                    continue
-
-                insertions_str, deletions_str, filepath = match.groups()
-
-                # Handle binary files (show as "-")
-                insertions = 0 if insertions_str == '-' else int(insertions_str)
-                deletions = 0 if deletions_str == '-' else int(deletions_str)
-
-                # Determine file status (simplified)
-                status = "modified"  # Default
-                if insertions > 0 and deletions == 0:
-                    status = "added"
-                elif insertions == 0 and deletions > 0:
-                    status = "deleted"
-
-                files_changed.append({
-                    "path": filepath,
-                    "insertions": insertions,
-                    "deletions": deletions,
-                    "status": status
-                })
-
-                commit_insertions += insertions
-                commit_deletions += deletions
-                files_set.add(filepath)
-
-        total_insertions += commit_insertions
-        total_deletions += commit_deletions
-
-        # Build complete commit object
-        commit = {
-            "sha": commit_meta["sha"],
-            "author": commit_meta["author"],
-            "email": commit_meta["email"],
-            "timestamp": commit_meta["timestamp"],
-            "date": commit_meta["date"],
-            "subject": commit_meta["subject"],
-            "body": commit_meta["body"],
-            "files_changed": files_changed
-        }
-
-        commits.append(commit)
-
-    # Calculate date range
-    date_range = None
-    if timestamps:
-        first_timestamp = min(timestamps)
-        last_timestamp = max(timestamps)
-        date_range = {
-            "first_commit_date": datetime.utcfromtimestamp(first_timestamp).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            "last_commit_date": datetime.utcfromtimestamp(last_timestamp).strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
-
-    # Build stats
-    stats = {
-        "total_commits": len(commits),
-        "total_files_changed": len(files_set),
-        "total_insertions": total_insertions,
-        "total_deletions": total_deletions,
-        "authors": sorted(list(authors_set)),
-        "date_range": date_range
-    }
-
-    return {
-        "commits": commits,
-        "stats": stats
-    }
-
-
-def get_git_history_data(
-    from_ref: str,
-    to_ref: str,
-    include_diffs: bool = False,
-    max_commits: int = DEFAULT_MAX_COMMITS,
-    cwd: str = "."
-) -> Dict[str, Any]:
-    """
-    High-level function to get git history between two refs.
-
-    This is the main entry point that coordinates all git operations.
-
-    Args:
-        from_ref: Starting ref
-        to_ref: Ending ref
-        include_diffs: Include full patch diffs
-        max_commits: Maximum commits to return
-        cwd: Working directory
-
-    Returns:
-        Complete git history data with commits, stats, and warnings
-
-    Raises:
-        GitRepoNotFoundError: If not in a git repository
-        InvalidRefError: If refs don't exist
-        EmptyCommitRangeError: If no commits between refs
-        CommitLimitExceededError: If too many commits (and strict mode)
-        GitOperationTimeoutError: If operations timeout
-    """
-    warnings = []
-
-    # Check if we're in a git repository
-    if not is_git_repository(cwd):
-        raise GitRepoNotFoundError(cwd)
-
-    # Resolve refs to SHAs
-    from_sha = resolve_ref(from_ref, cwd)
-    to_sha = resolve_ref(to_ref, cwd)
-
-    # Check if refs are identical
-    if from_sha == to_sha:
-        raise EmptyCommitRangeError(from_ref, to_ref)
-
-    # Get commit count
-    count = get_commit_count(from_ref, to_ref, cwd)
-
-    if count == 0:
-        raise EmptyCommitRangeError(from_ref, to_ref)
-
-    # Warn if limit reached
-    if count > max_commits:
-        warnings.append(
-            f"⚠️  Commit limit reached: showing first {max_commits} of {count} commits. "
-            f"Use --max-commits to increase limit."
-        )
-        logger.warning(f"Commit count {count} exceeds max_commits {max_commits}")
-
-    # Warn about large diffs
-    if include_diffs and count > 50:
-        warnings.append(
-            f"⚠️  Including diffs for {min(count, max_commits)} commits may be slow."
-        )
-
-    # Run git log
-    raw_output = run_git_log(
-        from_ref=from_ref,
-        to_ref=to_ref,
-        include_diffs=include_diffs,
-        max_commits=max_commits,
-        cwd=cwd
-    )
-
-    # Parse output
-    parsed = parse_git_log_output(raw_output, from_ref, to_ref)
-
-    # Build final result
-    result = {
-        "from_ref": from_ref,
-        "to_ref": to_ref,
-        "from_sha": from_sha,
-        "to_sha": to_sha,
-        "commits": parsed["commits"],
-        "stats": parsed["stats"],
-        "warnings": warnings
-    }
-
-    logger.info(
-        f"Retrieved {result['stats']['total_commits']} commits "
-        f"from {from_ref}..{to_ref}"
-    )
-
-    return result
+"""
+Git operations and commit parsing for release notes.
+
+This module provides low-level git operations using subprocess (stdlib only).
+All functions assume they're running in a git repository context.
+"""
+import itertools
+import subprocess
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Any, NoReturn, Optional, Tuple
+import logging
+
+from .errors import (
+    GitRepoNotFoundError,
+    InvalidRefError,
+    EmptyCommitRangeError,
+    CommitLimitExceededError,
+    GitOperationTimeoutError,
+    InternalError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_COMMITS = 200
+GIT_TIMEOUT_SECONDS = 30
+# git log -z output: every commit starts with RECORD_SEPARATOR, and its
+# metadata fields and numstat entries are NUL-terminated. Output is parsed
+# as bytes; only the fields that end up in the result are decoded
+RECORD_SEPARATOR = b"\x1e"
+FIELD_SEPARATOR = b"\x00"
+# sha, author, email, timestamp, subject, body
+METADATA_FIELD_COUNT = 6
+# A commit's first field: RS and a full SHA-1 (or SHA-256) commit id
+_RECORD_START_RE = re.compile(rb'\x1e([0-9a-f]{40}|[0-9a-f]{64})')
+# Start of a numstat entry: "insertions\tdeletions\t" ("-" for binary files)
+_NUMSTAT_RE = re.compile(rb'(?:\d+|-)\t(?:\d+|-)\t')
+# git --raw status letters -> files_changed status
+FILE_STATUS_BY_CODE = {
+    b'A': 'added',
+    b'D': 'deleted',
+    b'M': 'modified',
+    b'T': 'modified',  # type change (e.g. file <-> symlink)
+    b'R': 'renamed',
+    b'C': 'copied',
+}
+
+# Maximum bytes read from the git log pipe at a time when streaming
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Cap on rename candidates per commit (git log -l). Inexact (similarity)
+# rename detection is quadratic in the candidates; past the cap git falls
+# back to exact renames only, so huge commits don't dominate the log
+RENAME_LIMIT = 200
+
+# Repository checks and full-SHA resolutions are cached per real cwd.
+# Symbolic refs (HEAD, branches, tags) can move at any time, so they are
+# never cached; entries expire instead of living forever
+REF_CACHE_TTL_SECONDS = 60
+NEGATIVE_REPO_CACHE_TTL_SECONDS = 5
+GIT_CACHE_MAX_ENTRIES = 1024
+
+# (kind, realpath(cwd), key) -> (value, monotonic expiry)
+_git_cache: Dict[Tuple[str, str, str], Tuple[Any, float]] = {}
+_MISSING = object()
+# A full SHA-1 or SHA-256 object name; it can only ever name one commit
+_FULL_SHA_RE = re.compile(r'[0-9a-f]{40}|[0-9a-f]{64}')
+# Git refs never contain control characters
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+
+def _cache_get(kind: str, cwd: str, key: str) -> Any:
+    """Return a live cached value, or _MISSING."""
+    entry = _git_cache.get((kind, os.path.realpath(cwd), key))
+    if entry is None or entry[1] <= time.monotonic():
+        return _MISSING
+    return entry[0]
+
+
+def _cache_put(kind: str, cwd: str, key: str, value: Any, ttl: float) -> None:
+    """Cache a value for ttl seconds."""
+    if len(_git_cache) >= GIT_CACHE_MAX_ENTRIES:
+        _git_cache.clear()
+    _git_cache[(kind, os.path.realpath(cwd), key)] = (value, time.monotonic() + ttl)
+
+
+def clear_git_cache() -> None:
+    """Drop all cached ref resolutions and repository checks."""
+    _git_cache.clear()
+
+
+def is_git_repository(path: str = ".") -> bool:
+    """
+    Check if the given path is inside a git repository.
+
+    Args:
+        path: Path to check (default: current directory)
+
+    Returns:
+        True if inside a git repository, False otherwise
+    """
+    # Fast path: repository root (.git directory, or .git file for
+    # worktrees/submodules) or a bare repository, no git process needed
+    if os.path.exists(os.path.join(path, ".git")) or (
+        os.path.isdir(os.path.join(path, "objects"))
+        and os.path.isfile(os.path.join(path, "HEAD"))
+    ):
+        return True
+
+    cached = _cache_get("repo", path, "")
+    if cached is not _MISSING:
+        return cached
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--git-dir"],
+            cwd=path,
+            capture_output=True,
+            timeout=5,
+            check=True,
+            text=True
+        )
+        is_repo = result.returncode == 0
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        is_repo = False
+
+    # A directory may become a repository (git init) at any time, so
+    # negative answers are only trusted briefly
+    ttl = REF_CACHE_TTL_SECONDS if is_repo else NEGATIVE_REPO_CACHE_TTL_SECONDS
+    _cache_put("repo", path, "", is_repo, ttl)
+    return is_repo
+
+
+def _check_ref(ref: str) -> None:
+    """
+    Reject a ref git would parse as an option or that can't be a ref.
+
+    Refs come from clients, so one starting with "-" (e.g. "--output=...")
+    must never reach a git command line, and one with a newline would split
+    into several lines of a --batch-check request.
+
+    Raises:
+        InvalidRefError: If ref is empty, starts with "-" or contains a
+            control character
+    """
+    if not ref or ref.startswith("-") or _CONTROL_CHAR_RE.search(ref):
+        raise InvalidRefError(ref)
+
+
+def resolve_ref(ref: str, cwd: str = ".") -> str:
+    """
+    Resolve a git ref (tag, branch, SHA) to the full SHA of the commit it names.
+
+    Args:
+        ref: Git reference (tag, branch, or SHA)
+        cwd: Working directory (default: current directory)
+
+    Returns:
+        Full commit SHA (annotated tags are peeled to their commit)
+
+    Raises:
+        InvalidRefError: If ref doesn't name a commit (or looks like an option)
+        GitRepoNotFoundError: If not in a git repository
+    """
+    _check_ref(ref)
+
+    # Only a full SHA always resolves the same way; anything else is
+    # resolved afresh so a moved branch or HEAD is never served stale
+    cacheable = _FULL_SHA_RE.fullmatch(ref) is not None
+    if cacheable:
+        cached = _cache_get("ref", cwd, ref)
+        if cached is not _MISSING:
+            return cached
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--end-of-options", f"{ref}^{{commit}}"],
+            cwd=cwd,
+            capture_output=True,
+            timeout=5,
+            check=True,
+            text=True
+        )
+        sha = result.stdout.strip()
+        logger.debug(f"Resolved {ref} -> {sha}")
+        if cacheable:
+            _cache_put("ref", cwd, ref, sha, REF_CACHE_TTL_SECONDS)
+        return sha
+
+    except subprocess.TimeoutExpired:
+        raise GitOperationTimeoutError(5)
+
+    except subprocess.CalledProcessError as e:
+        if "not a git repository" in e.stderr.lower():
+            raise GitRepoNotFoundError(cwd)
+        raise InvalidRefError(ref)
+
+    except FileNotFoundError:
+        # subprocess reports a missing cwd the same way as a missing git binary
+        if not os.path.isdir(cwd):
+            raise GitRepoNotFoundError(cwd)
+        raise InternalError("git command not found. Is git installed?")
+
+
+def _resolve_ref_range(from_ref: str, to_ref: str, cwd: str = ".") -> Tuple[str, str]:
+    """
+    Resolve both ends of a commit range to commit SHAs.
+
+    Args:
+        from_ref: Starting ref
+        to_ref: Ending ref
+        cwd: Working directory
+
+    Returns:
+        (from_sha, to_sha)
+
+    Both ends are resolved by a single git rev-parse; _find_invalid_refs
+    only runs on failure, to name the bad ref.
+
+    Raises:
+        GitRepoNotFoundError: If cwd is not inside a git repository
+        InvalidRefError: If either ref doesn't name a commit
+    """
+    _check_ref(from_ref)
+    _check_ref(to_ref)
+
+    refs = (from_ref, to_ref)
+    cached = [
+        _cache_get("ref", cwd, ref) if _FULL_SHA_RE.fullmatch(ref) else _MISSING
+        for ref in refs
+    ]
+    if _MISSING not in cached:
+        return cached[0], cached[1]
+
+    # Without --verify rev-parse takes several revisions, but it also echoes
+    # "--end-of-options"/"--" and expands range syntax (e.g. "a..b" or
+    # "^a"), so anything but exactly two full SHAs is treated as a failure
+    stderr = ""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--end-of-options",
+             f"{from_ref}^{{commit}}", f"{to_ref}^{{commit}}", "--"],
+            cwd=cwd,
+            capture_output=True,
+            timeout=5,
+            check=True,
+            text=True
+        )
+        shas = [
+            line for line in result.stdout.splitlines()
+            if line not in ("--end-of-options", "--")
+        ]
+        if len(shas) == 2 and all(_FULL_SHA_RE.fullmatch(sha) for sha in shas):
+            for ref, sha in zip(refs, shas):
+                if _FULL_SHA_RE.fullmatch(ref):
+                    _cache_put("ref", cwd, ref, sha, REF_CACHE_TTL_SECONDS)
+            logger.debug(f"Resolved {from_ref}..{to_ref} -> {shas[0]}..{shas[1]}")
+            return shas[0], shas[1]
+
+    except subprocess.TimeoutExpired:
+        raise GitOperationTimeoutError(5)
+
+    except subprocess.CalledProcessError as e:
+        if "not a git repository" in e.stderr.lower():
+            raise GitRepoNotFoundError(cwd)
+        stderr = e.stderr
+
+    except FileNotFoundError:
+        # subprocess reports a missing cwd the same way as a missing git binary
+        if not os.path.isdir(cwd):
+            raise GitRepoNotFoundError(cwd)
+        raise InternalError("git command not found. Is git installed?")
+
+    invalid_refs = _find_invalid_refs(list(refs), cwd)
+    if invalid_refs:
+        raise InvalidRefError(invalid_refs[0])
+    # Neither is missing, so one names a non-commit; git quotes it in the error
+    if f"'{to_ref}^{{commit}}'" in stderr and f"'{from_ref}^{{commit}}'" not in stderr:
+        raise InvalidRefError(to_ref)
+    raise InvalidRefError(from_ref)
+
+
+def _find_invalid_refs(refs: List[str], cwd: str = ".") -> List[str]:
+    """
+    Find which of several refs don't resolve, using a single git call.
+
+    Args:
+        refs: Git refs to check
+        cwd: Working directory
+
+    Returns:
+        The refs that don't name an object, in input order (empty if they
+        all resolve or the check itself fails)
+    """
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            input="".join(f"{ref}\n" for ref in refs),
+            cwd=cwd,
+            capture_output=True,
+            timeout=5,
+            check=True,
+            text=True
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
+        return []
+
+    # One output line per input ref: "<sha> <type> <size>", or
+    # "<ref> missing" / "<ref> ambiguous" when it doesn't resolve
+    return [
+        ref for ref, line in zip(refs, result.stdout.splitlines())
+        if line.endswith((" missing", " ambiguous"))
+    ]
+
+
+def get_commit_count(from_ref: str, to_ref: str, cwd: str = ".") -> int:
+    """
+    Count commits between two refs.
+
+    Args:
+        from_ref: Starting ref
+        to_ref: Ending ref
+        cwd: Working directory
+
+    Returns:
+        Number of commits in range from_ref..to_ref
+
+    Raises:
+        InvalidRefError: If refs don't exist
+        GitOperationTimeoutError: If operation times out
+    """
+    _check_ref(from_ref)
+    _check_ref(to_ref)
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-list", "--count", "--no-merges", "--end-of-options",
+             f"{from_ref}..{to_ref}"],
+            cwd=cwd,
+            capture_output=True,
+            timeout=GIT_TIMEOUT_SECONDS,
+            check=True,
+            text=True
+        )
+        count = int(result.stdout.strip())
+        logger.debug(f"Commit count {from_ref}..{to_ref}: {count}")
+        return count
+
+    except subprocess.TimeoutExpired:
+        raise GitOperationTimeoutError(GIT_TIMEOUT_SECONDS)
+
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.strip().lower()
+
+        if "unknown revision" in stderr or "bad revision" in stderr:
+            # Determine which ref is invalid
+            invalid_refs = _find_invalid_refs([from_ref, to_ref], cwd)
+            raise InvalidRefError(invalid_refs[0] if invalid_refs else from_ref)
+        else:
+            raise InternalError(f"git rev-list failed: {e.stderr}")
+
+    except ValueError as e:
+        raise InternalError(f"Failed to parse commit count: {e}")
+
+
+def run_git_log(
+    from_ref: str,
+    to_ref: str,
+    max_commits: int = DEFAULT_MAX_COMMITS,
+    cwd: str = ".",
+    timeout: int = GIT_TIMEOUT_SECONDS,
+    detect_renames: bool = True
+) -> str:
+    """
+    Run git log with custom format to get commit history.
+
+    Args:
+        from_ref: Starting ref
+        to_ref: Ending ref
+        max_commits: Maximum commits to return
+        cwd: Working directory
+        timeout: Timeout in seconds
+        detect_renames: Report renames/copies (False skips rename detection;
+            renamed files then show up as deleted + added)
+
+    Returns:
+        Raw git log output
+
+    Raises:
+        InvalidRefError: If refs don't exist
+        GitOperationTimeoutError: If operation times out
+        InternalError: If git command fails
+    """
+    cmd = _build_git_log_command(from_ref, to_ref, max_commits, detect_renames)
+
+    logger.debug(f"Running: {' '.join(cmd)}")
+
+    try:
+        result = subprocess.run(
+            cmd,
+            cwd=cwd,
+            capture_output=True,
+            timeout=timeout,
+            check=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace'  # Replace invalid UTF-8 with replacement char
+        )
+
+        return result.stdout
+
+    except subprocess.TimeoutExpired:
+        raise GitOperationTimeoutError(timeout)
+
+    except subprocess.CalledProcessError as e:
+        _raise_git_log_error(e.stderr, from_ref, to_ref, cwd)
+
+    except FileNotFoundError:
+        raise InternalError("git command not found. Is git installed?")
+
+
+def iter_git_log_records(
+    from_ref: str,
+    to_ref: str,
+    max_commits: int = DEFAULT_MAX_COMMITS,
+    cwd: str = ".",
+    timeout: int = GIT_TIMEOUT_SECONDS,
+    detect_renames: bool = True,
+    skip: int = 0
+) -> Iterator[bytes]:
+    """
+    Stream git log output one commit record at a time.
+
+    Unlike run_git_log the output is never buffered as a whole: records are
+    yielded as soon as git writes them, so parsing overlaps with git and peak
+    memory is bounded by the largest single commit.
+
+    Args:
+        from_ref: Starting ref
+        to_ref: Ending ref
+        max_commits: Maximum commits to return
+        cwd: Working directory
+        timeout: Timeout in seconds for the whole git log run
+        detect_renames: Report renames/copies (see run_git_log)
+        skip: Number of (newest) commits to skip before the first record
+
+    Yields:
+        Commit records for parse_git_log_records
+
+    Raises:
+        InvalidRefError: If refs don't exist
+        GitOperationTimeoutError: If operation times out
+        InternalError: If git command fails
+    """
+    cmd = _build_git_log_command(
+        from_ref, to_ref, max_commits, detect_renames, skip
+    )
+
+    logger.debug(f"Streaming: {' '.join(cmd)}")
+
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise InternalError("git command not found. Is git installed?")
+
+    # Watchdog: kill git if the whole run takes longer than the timeout
+    timed_out = threading.Event()
+
+    def _kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    watchdog = threading.Timer(timeout, _kill_on_timeout)
+    watchdog.daemon = True
+    watchdog.start()
+
+    splitter = _RecordSplitter()
+    try:
+        while True:
+            # read1 returns whatever is available instead of waiting for a
+            # full chunk, so records reach the parser while git is running
+            chunk = proc.stdout.read1(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield from splitter.feed(chunk)
+
+        stderr = proc.stderr.read().decode('utf-8', errors='replace')
+        returncode = proc.wait()
+
+    finally:
+        watchdog.cancel()
+        # Consumer stopped early (or an error occurred): don't leave git running
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if timed_out.is_set():
+        raise GitOperationTimeoutError(timeout)
+
+    if returncode != 0:
+        _raise_git_log_error(stderr, from_ref, to_ref, cwd)
+
+    record = splitter.finish()
+    if record:
+        yield record
+
+
+class _RecordSplitter:
+    """
+    Split git log -z output into commit records at real commit boundaries.
+
+    Subjects, bodies, author names and paths are free-form and may contain
+    RECORD_SEPARATOR themselves, so the output can't simply be split on it.
+    Instead the NUL-terminated entries are walked: the metadata fields and
+    the path(s) following each --raw/numstat entry are taken by count, and
+    only the entries in between (where git itself decides what comes next)
+    are checked for the start of the next commit. Any separator git writes
+    between commits has no NUL of its own, so it runs into the next
+    commit's SHA field; the last RS in that entry marks the boundary.
+
+    Records are produced exactly as splitting on RS would for well-formed
+    output: without the leading RS, metadata first (see parse_git_log_records).
+    """
+
+    def __init__(self):
+        # Bytes after the last NUL seen, completed by the next chunk
+        self._tail = b''
+        # Entries of the record being received (None before the first one)
+        self._entries: Optional[List[bytes]] = None
+        # Entries still to take without inspecting (fields, paths)
+        self._pending = 0
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Add a chunk of output.
+
+        Args:
+            chunk: Next bytes of git log output
+
+        Returns:
+            Records completed by this chunk
+        """
+        entries = (self._tail + chunk if self._tail else chunk).split(FIELD_SEPARATOR)
+        self._tail = entries.pop()
+
+        records = []
+        current = self._entries
+        pending = self._pending
+        for entry in entries:
+            if pending:
+                pending -= 1
+                current.append(entry)
+                continue
+
+            stripped = entry.lstrip(b'\n')
+            if stripped.startswith(b':'):
+                # --raw entry, followed by its path (old and new path for
+                # renames and copies)
+                code = stripped.rsplit(b' ', 1)[-1][:1]
+                pending = 2 if code in (b'R', b'C') else 1
+            else:
+                numstat = _NUMSTAT_RE.match(stripped)
+                if numstat:
+                    # Renames leave the path empty; old and new path follow
+                    pending = 2 if numstat.end() == len(stripped) else 0
+                else:
+                    start = entry.rfind(RECORD_SEPARATOR)
+                    if start >= 0 and _RECORD_START_RE.fullmatch(entry, start):
+                        if current is not None:
+                            current.append(entry[:start])
+                            records.append(FIELD_SEPARATOR.join(current))
+                        current = [entry[start + 1:]]
+                        pending = METADATA_FIELD_COUNT - 1
+                        continue
+
+            if current is not None:
+                current.append(entry)
+
+        self._entries = current
+        self._pending = pending
+        return records
+
+    def finish(self) -> Optional[bytes]:
+        """Return the last record once the output has ended (None if there was none)."""
+        if self._entries is None:
+            return None
+        self._entries.append(self._tail)
+        record = FIELD_SEPARATOR.join(self._entries)
+        self._entries = None
+        self._tail = b''
+        return record
+
+
+def split_git_log_records(output: bytes) -> List[bytes]:
+    """
+    Split complete git log output into commit records.
+
+    Args:
+        output: Raw git log -z output (see _build_git_log_command)
+
+    Returns:
+        Commit records for parse_git_log_records
+    """
+    splitter = _RecordSplitter()
+    records = splitter.feed(output)
+    last = splitter.finish()
+    if last is not None:
+        records.append(last)
+    return records
+
+
+def get_commit_diff(sha: str, cwd: str = ".", timeout: int = GIT_TIMEOUT_SECONDS) -> str:
+    """
+    Get the patch introduced by a single commit.
+
+    Args:
+        sha: Commit SHA (or any ref naming a commit)
+        cwd: Working directory
+        timeout: Timeout in seconds
+
+    Returns:
+        Patch text (empty for commits without content changes)
+
+    Raises:
+        InvalidRefError: If the commit doesn't exist
+        GitRepoNotFoundError: If not in a git repository
+        GitOperationTimeoutError: If operation times out
+    """
+    # Verify the (client-supplied) value names a commit before it reaches
+    # git show; only the resolved SHA is ever passed on
+    commit_sha = resolve_ref(sha, cwd)
+
+    try:
+        result = subprocess.run(
+            ["git", "show", "--format=", "-p", "--end-of-options", commit_sha, "--"],
+            cwd=cwd,
+            capture_output=True,
+            timeout=timeout,
+            check=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+        return result.stdout
+
+    except subprocess.TimeoutExpired:
+        raise GitOperationTimeoutError(timeout)
+
+    except subprocess.CalledProcessError as e:
+        if "not a git repository" in e.stderr.lower():
+            raise GitRepoNotFoundError(cwd)
+        raise InvalidRefError(sha)
+
+    except FileNotFoundError:
+        raise InternalError("git command not found. Is git installed?")
+
+
+def _build_git_log_command(
+    from_ref: str,
+    to_ref: str,
+    max_commits: int,
+    detect_renames: bool = True,
+    skip: int = 0
+) -> List[str]:
+    """Build the git log command shared by run_git_log and iter_git_log_records."""
+    _check_ref(from_ref)
+    _check_ref(to_ref)
+
+    # Format: RS SHA NUL author NUL email NUL timestamp NUL subject NUL body NUL
+    # followed by NUL-terminated --raw and numstat entries (-z)
+    log_format = "%x1e%H%x00%an%x00%ae%x00%at%x00%s%x00%b%x00"
+
+    cmd = [
+        "git", "log",
+        "--no-merges",
+        "-z",  # NUL-terminate fields and numstat entries
+        f"--format={log_format}",
+        "--raw",  # Exact per-file status (A/M/D/R...)
+        "--numstat",  # Show file stats
+        f"-{max_commits}",  # Limit commits
+        f"-l{RENAME_LIMIT}" if detect_renames else "--no-renames",
+    ]
+
+    if skip > 0:
+        cmd.append(f"--skip={skip}")  # Page past commits already returned
+
+    # Everything after --end-of-options is a revision, never an option
+    cmd += ["--end-of-options", f"{from_ref}..{to_ref}"]
+
+    return cmd
+
+
+def _raise_git_log_error(stderr: str, from_ref: str, to_ref: str, cwd: str) -> NoReturn:
+    """Map a failed git log's stderr to the matching error."""
+    stderr_lower = stderr.strip().lower()
+
+    if "unknown revision" in stderr_lower or "bad revision" in stderr_lower:
+        # Determine which ref is invalid
+        invalid_refs = _find_invalid_refs([from_ref, to_ref], cwd)
+        raise InvalidRefError(invalid_refs[0] if invalid_refs else from_ref)
+    else:
+        raise InternalError(f"git log failed: {stderr}")
+
+
+def _iso_utc(timestamp: int) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string (YYYY-MM-DDTHH:MM:SSZ)."""
+    t = time.gmtime(timestamp)
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    )
+
+
+def parse_git_log_output(raw_output: str, from_ref: str, to_ref: str) -> Dict[str, Any]:
+    """
+    Parse git log output into structured JSON.
+
+    Args:
+        raw_output: Raw output from git log
+        from_ref: Original from_ref (for metadata)
+        to_ref: Original to_ref (for metadata)
+
+    Returns:
+        Dictionary with commits, stats, and warnings
+
+    Format:
+        {
+            "commits": [
+                {
+                    "sha": "...",
+                    "author": "...",
+                    "email": "...",
+                    "timestamp": 1234567890,
+                    "date": "2024-01-15T10:30:00Z",
+                    "subject": "...",
+                    "body": "...",
+                    "files_changed": [
+                        {
+                            "path": "src/file.py",
+                            "insertions": 50,
+                            "deletions": 10,
+                            "status": "modified"
+                        }
+                    ]
+                }
+            ],
+            "stats": {
+                "total_commits": 15,
+                "total_files_changed": 42,
+                "total_insertions": 1200,
+                "total_deletions": 300,
+                "authors": ["Jane", "John"],
+                "date_range": {...}
+            }
+        }
+    """
+    return parse_git_log_records(split_git_log_records(raw_output.encode('utf-8')))
+
+
+def parse_git_log_records(records: Iterable[bytes]) -> Dict[str, Any]:
+    """
+    Parse git log records (one per commit) into commits and stats.
+
+    Each record holds a commit's NUL-terminated metadata fields followed by
+    its --raw and numstat entries. Records are consumed one at a time, so
+    this accepts the lazy stream from iter_git_log_records as well as a
+    pre-split list. Records stay bytes; only the fields copied into the
+    result are decoded.
+
+    Args:
+        records: Commit records without their leading RECORD_SEPARATOR
+
+    Returns:
+        Dictionary with commits and stats (see parse_git_log_output)
+    """
+    commits = []
+    authors_set = set()
+    total_insertions = 0
+    total_deletions = 0
+    files_set = set()
+    # Date range bounds, tracked as commits stream past
+    first_timestamp = None
+    last_timestamp = None
+
+    for record in records:
+        if not record:
+            continue
+
+        fields = record.split(FIELD_SEPARATOR)
+        if len(fields) < METADATA_FIELD_COUNT:
+            logger.warning(f"Invalid commit metadata: {record[:100]!r}")
+            continue
+
+        sha = fields[0].decode('ascii', errors='replace').strip()
+        # Authors, emails and paths repeat across commits; interning lets
+        # the copies share one string (freed once no commit refers to it)
+        author = sys.intern(fields[1].decode('utf-8', errors='replace').strip())
+        email = sys.intern(fields[2].decode('utf-8', errors='replace').strip())
+        timestamp_str = fields[3].decode('ascii', errors='replace').strip()
+        subject = fields[4].decode('utf-8', errors='replace').strip()
+        body = fields[5].decode('utf-8', errors='replace').strip()
+        if '\r' in body:
+            # Match the newline translation of text-mode reads
+            body = body.replace('\r\n', '\n').replace('\r', '\n')
+
+        # Convert timestamp
+        try:
+            timestamp = int(timestamp_str)
+            date_iso = _iso_utc(timestamp)
+            if first_timestamp is None or timestamp < first_timestamp:
+                first_timestamp = timestamp
+            if last_timestamp is None or timestamp > last_timestamp:
+                last_timestamp = timestamp
+        except (ValueError, OSError, OverflowError):
+            logger.warning(f"Invalid timestamp: {timestamp_str}")
+            timestamp = 0
+            date_iso = "1970-01-01T00:00:00Z"
+
+        # Track author
+        authors_set.add(author)
+
+        files_changed = []
+        commit_insertions = 0
+        commit_deletions = 0
+        # path -> status reported by the --raw entries
+        statuses = {}
+
+        # --raw entries: ":<modes> <shas> <status>" followed by the path
+        # (old and new paths for renames/copies) come first. Then numstat
+        # entries: "insertions\tdeletions\tpath", or for renames
+        # "insertions\tdeletions\t" followed by the old and new paths.
+        # Every path is a separate NUL-terminated entry
+        entries = iter(fields[METADATA_FIELD_COUNT:])
+        for entry in entries:
+            entry = entry.lstrip(b'\n')
+            if entry.startswith(b':'):
+                code = entry.rsplit(b' ', 1)[-1][:1]
+                path = next(entries, b'')
+                if code in (b'R', b'C'):
+                    path = next(entries, b'')
+                statuses[path] = FILE_STATUS_BY_CODE.get(code, 'modified')
+                continue
+
+            parts = entry.split(b'\t', 2)
+            if len(parts) != 3:
+                # Separator, not a numstat entry
+                continue
+
+            insertions_str, deletions_str, raw_path = parts
+            if not raw_path:
+                next(entries, None)  # old path
+                raw_path = next(entries, b'')
+
+            # Handle binary files (show as "-")
+            try:
+                insertions = 0 if insertions_str == b'-' else int(insertions_str)
+                deletions = 0 if deletions_str == b'-' else int(deletions_str)
+            except ValueError:
+                continue
+
+            filepath = sys.intern(raw_path.decode('utf-8', errors='replace'))
+
+            # File status from --raw; guess from line counts if it's missing
+            status = statuses.get(raw_path)
+            if status is None:
+                status = "modified"  # Default
+                if insertions > 0 and deletions == 0:
+                    status = "added"
+                elif insertions == 0 and deletions > 0:
+                    status = "deleted"
+
+            files_changed.append({
+                "path": filepath,
+                "insertions": insertions,
+                "deletions": deletions,
+                "status": status
+            })
+
+            commit_insertions += insertions
+            commit_deletions += deletions
+            files_set.add(filepath)
+
+        total_insertions += commit_insertions
+        total_deletions += commit_deletions
+
+        # Build complete commit object
+        commits.append({
+            "sha": sha,
+            "author": author,
+            "email": email,
+            "timestamp": timestamp,
+            "date": date_iso,
+            "subject": subject,
+            "body": body,
+            "files_changed": files_changed
+        })
+
+    # Calculate date range
+    date_range = None
+    if first_timestamp is not None:
+        date_range = {
+            "first_commit_date": _iso_utc(first_timestamp),
+            "last_commit_date": _iso_utc(last_timestamp)
+        }
+
+    # Build stats
+    stats = {
+        "total_commits": len(commits),
+        "total_files_changed": len(files_set),
+        "total_insertions": total_insertions,
+        "total_deletions": total_deletions,
+        "authors": sorted(authors_set),
+        "date_range": date_range
+    }
+
+    return {
+        "commits": commits,
+        "stats": stats
+    }
+
+
+def get_git_history_data(
+    from_ref: str,
+    to_ref: str,
+    max_commits: int = DEFAULT_MAX_COMMITS,
+    cwd: str = ".",
+    detect_renames: bool = True,
+    cursor: int = 0
+) -> Dict[str, Any]:
+    """
+    High-level function to get git history between two refs.
+
+    This is the main entry point that coordinates all git operations.
+
+    Commit records never carry patch text: git log runs without -p, since
+    generating every patch up front dominated the cost and the parsed
+    commits had no place for it. Fetch a commit's patch on demand with
+    get_commit_diff.
+
+    Args:
+        from_ref: Starting ref
+        to_ref: Ending ref
+        max_commits: Maximum commits to return
+        cwd: Working directory
+        detect_renames: Report renames/copies; pass False to skip rename
+            detection entirely on very large ranges (renamed files are then
+            reported as deleted + added)
+        cursor: Number of (newest) commits of the range to skip; pass the
+            next_cursor of a truncated result to get the following page
+            (with the result's from_sha/to_sha as refs, so the offsets stay
+            valid if a branch moves between pages)
+
+    Returns:
+        Complete git history data with commits, stats, and warnings.
+        next_cursor is set when more commits remain past this page, else None
+
+    Raises:
+        GitRepoNotFoundError: If not in a git repository
+        InvalidRefError: If refs don't exist
+        EmptyCommitRangeError: If no commits between refs
+        CommitLimitExceededError: If too many commits (and strict mode)
+        GitOperationTimeoutError: If operations timeout
+    """
+    warnings = []
+
+    # Resolve refs to commit SHAs (also detects a missing repository and
+    # rejects option-like refs). Everything below runs on the SHAs, so the
+    # commits returned always match from_sha/to_sha even if a ref moves
+    from_sha, to_sha = _resolve_ref_range(from_ref, to_ref, cwd)
+
+    # Check if refs are identical
+    if from_sha == to_sha:
+        raise EmptyCommitRangeError(from_ref, to_ref)
+
+    # Stream git log straight into the parser. One commit past the limit is
+    # requested so overflow is detected without a separate rev-list --count
+    records = iter_git_log_records(
+        from_ref=from_sha,
+        to_ref=to_sha,
+        max_commits=max_commits + 1,
+        cwd=cwd,
+        detect_renames=detect_renames,
+        skip=cursor
+    )
+    try:
+        parsed = parse_git_log_records(itertools.islice(records, max_commits))
+        limit_exceeded = next(records, None) is not None
+    finally:
+        records.close()
+
+    count = parsed["stats"]["total_commits"]
+
+    if count == 0:
+        raise EmptyCommitRangeError(from_ref, to_ref)
+
+    # Warn if limit reached (only then is the full count worth a git call)
+    next_cursor = None
+    if limit_exceeded:
+        next_cursor = cursor + count
+        total = get_commit_count(from_sha, to_sha, cwd)
+        if cursor:
+            shown = f"commits {cursor + 1}-{next_cursor}"
+        else:
+            shown = f"first {max_commits}"
+        warnings.append(
+            f"⚠️  Commit limit reached: showing {shown} of {total} commits. "
+            f"Use --max-commits to increase limit, or pass cursor={next_cursor} for the next page."
+        )
+        logger.warning(f"Commit count {total} exceeds max_commits {max_commits}")
+
+    # Build final result
+    result = {
+        "from_ref": from_ref,
+        "to_ref": to_ref,
+        "from_sha": from_sha,
+        "to_sha": to_sha,
+        "commits": parsed["commits"],
+        "stats": parsed["stats"],
+        "warnings": warnings,
+        "next_cursor": next_cursor
+    }
+
+    logger.info(
+        f"Retrieved {result['stats']['total_commits']} commits "
+        f"from {from_ref}..{to_ref}"
+    )
+
+    return result
@@ -1,300 +1,352 @@
-"""
-Release risk scoring and assessment.
-
-This module calculates risk scores for releases based on:
-- Breaking changes
-- Customer-impacting commits
-- Large commits
-- Test coverage
-- Other quality metrics
-"""
-import logging
-from typing import Dict, List, Any, Optional
-
-logger = logging.getLogger(__name__)
-
-
-# Risk level thresholds
-RISK_LEVEL_LOW = 3
-RISK_LEVEL_MODERATE = 6
-
-# Scoring weights
-BREAKING_CHANGE_POINTS = 2
-CUSTOMER_IMPACT_POINTS = 1
-CUSTOMER_IMPACT_CAP = 3
-LARGE_COMMIT_POINTS = 1
-LOW_COVERAGE_POINTS = 1
-COVERAGE_THRESHOLD = 80.0
-
-
-def calculate_release_risk(
-    commits: List[Dict[str, Any]],
-    ci_report: Optional[Dict[str, Any]] = None,
-    customer_watchlist: Optional[Dict[str, Any]] = None
-) -> Dict[str, Any]:
-    """
-    Calculate risk score and level for a release.
-
-    Scoring:
-    - +2 per breaking change commit
-    - +1 per customer-impacting commit (capped at +3 total)
-    - +1 per large commit (>500 lines)
-    - +1 if test coverage < 80%
-
-    Risk levels:
-    - low: score < 3
-    - moderate: score 3-5
-    - high: score >= 6
-
-    Args:
-        commits: List of categorized commits
-        ci_report: Optional CI report dict
-        customer_watchlist: Optional customer watchlist dict
-
-    Returns:
-        dict with score, level, factors
-    """
-    score = 0
-    factors = []
-
-    # Single pass accumulator - O(n) instead of multiple O(n) passes
-    breaking_count = 0
-    customer_impact_count = 0
-    large_count = 0
-    all_features = set()
-    all_paths = set()
-
-    for commit in commits:
-        if commit.get('is_breaking', False):
-            breaking_count += 1
-
-        impacts = commit.get('customer_impacts', {})
-        impact_count = impacts.get('impact_count', 0)
-        if impact_count > 0:
-            customer_impact_count += 1
-            all_features.update(impacts.get('matched_features', []))
-            all_paths.update(impacts.get('matched_paths', []))
-
-        if commit.get('is_large', False):
-            large_count += 1
-
-    # Add factors based on counts
-    if breaking_count > 0:
-        points = breaking_count * BREAKING_CHANGE_POINTS
-        score += points
-        factors.append({
-            'reason': f'{breaking_count} breaking change commit(s)',
-            'points': points,
-            'severity': 'high'
-        })
-
-    if customer_impact_count > 0:
-        # Cap at CUSTOMER_IMPACT_CAP points
-        points = min(customer_impact_count * CUSTOMER_IMPACT_POINTS, CUSTOMER_IMPACT_CAP)
-        score += points
-        factors.append({
-            'reason': f'{customer_impact_count} customer-impacting commit(s)',
-            'points': points,
-            'severity': 'medium'
-        })
-
-        if all_features:
-            factors.append({
-                'reason': f'Impacts features: {", ".join(sorted(all_features))}',
-                'points': 0,
-                'severity': 'info'
-            })
-        if all_paths:
-            factors.append({
-                'reason': f'Changes in high-risk paths: {", ".join(sorted(all_paths))}',
-                'points': 0,
-                'severity': 'info'
-            })
-
-    if large_count > 0:
-        points = large_count * LARGE_COMMIT_POINTS
-        score += points
-        factors.append({
-            'reason': f'{large_count} large commit(s) (>500 lines)',
-            'points': points,
-            'severity': 'low'
-        })
-
-    # Check test coverage
-    if ci_report:
-        coverage_data = ci_report.get('coverage', {})
-        line_coverage = coverage_data.get('line_percent')
-
-        if line_coverage is not None:
-            if line_coverage < COVERAGE_THRESHOLD:
-                points = LOW_COVERAGE_POINTS
-                score += points
-                factors.append({
-                    'reason': f'Test coverage below threshold ({line_coverage:.1f}% < {COVERAGE_THRESHOLD}%)',
-                    'points': points,
-                    'severity': 'medium'
-                })
-
-            # Also note coverage drops
-            previous_coverage = coverage_data.get('previous', {}).get('line_percent')
-            if previous_coverage is not None:
-                coverage_drop = previous_coverage - line_coverage
-                if coverage_drop > 5:
-                    factors.append({
-                        'reason': f'Coverage dropped {coverage_drop:.1f}% ({previous_coverage:.1f}% → {line_coverage:.1f}%)',
-                        'points': 0,
-                        'severity': 'warning'
-                    })
-
-        # Check for failed tests
-        test_summary = ci_report.get('test_summary', {})
-        failed_tests = test_summary.get('failed', 0)
-
-        if failed_tests > 0:
-            factors.append({
-                'reason': f'{failed_tests} test(s) failing',
-                'points': 0,
-                'severity': 'critical'
-            })
-
-    # Determine risk level
-    if score >= RISK_LEVEL_MODERATE:
-        level = 'high'
-    elif score >= RISK_LEVEL_LOW:
-        level = 'moderate'
-    else:
-        level = 'low'
-
-    logger.info(f"Calculated release risk: {level} (score: {score})")
-
-    return {
-        'score': score,
-        'level': level,
-        'factors': factors
-    }
-
-
-def get_risk_recommendations(
-    risk_assessment: Dict[str, Any],
-    commits: List[Dict[str, Any]],
-    ci_report: Optional[Dict[str, Any]] = None
-) -> List[str]:
-    """
-    Generate actionable recommendations based on risk assessment.
-
-    Args:
-        risk_assessment: Risk assessment dict from calculate_release_risk
-        commits: List of categorized commits
-        ci_report: Optional CI report dict
-
-    Returns:
-        List of recommendation strings
-    """
-    recommendations = []
-    level = risk_assessment['level']
-
-    # Single pass count accumulator
-    breaking_count = 0
-    customer_impact_count = 0
-    high_risk_path_count = 0
-    large_count = 0
-
-    for commit in commits:
-        if commit.get('is_breaking', False):
-            breaking_count += 1
-        if commit.get('customer_impacts', {}).get('impact_count', 0) > 0:
-            customer_impact_count += 1
-        if commit.get('customer_impacts', {}).get('matched_paths'):
-            high_risk_path_count += 1
-        if commit.get('is_large', False):
-            large_count += 1
-
-    # Generate recommendations based on counts
-    if breaking_count > 0:
-        recommendations.append(
-            f'⚠️  Review {breaking_count} breaking change(s) with stakeholders'
-        )
-        recommendations.append(
-            '📝 Update migration guide and changelog with breaking changes'
-        )
-
-    if customer_impact_count > 0:
-        recommendations.append(
-            f'📢 Notify customer success about {customer_impact_count} impactful change(s)'
-        )
-
-    if high_risk_path_count > 0:
-        recommendations.append(
-            '🔍 Extra QA attention on auth, payment, or billing flows'
-        )
-
-    if large_count > 0:
-        recommendations.append(
-            f'👀 Manual review of {large_count} large commit(s) for hidden issues'
-        )
-
-    # CI issues
-    if ci_report:
-        failed_tests = ci_report.get('test_summary', {}).get('failed', 0)
-        if failed_tests > 0:
-            recommendations.append(
-                f'🚨 Fix {failed_tests} failing test(s) before release'
-            )
-
-        coverage = ci_report.get('coverage', {}).get('line_percent')
-        if coverage and coverage < COVERAGE_THRESHOLD:
-            recommendations.append(
-                f'📊 Improve test coverage (currently {coverage:.1f}%, target {COVERAGE_THRESHOLD}%)'
-            )
-
-    # General recommendations based on risk level
-    if level == 'high':
-        recommendations.append(
-            '⏸️  Consider splitting this release into smaller, lower-risk releases'
-        )
-        recommendations.append(
-            '🎯 Use feature flags for gradual rollout of high-risk changes'
-        )
-    elif level == 'moderate':
-        recommendations.append(
-            '✅ Standard QA process with extra attention to flagged areas'
-        )
-
-    return recommendations
-
-
-def summarize_risk_by_category(commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Summarize risk factors by commit category.
-
-    Args:
-        commits: List of categorized commits
-
-    Returns:
-        dict with risk breakdown by category
-    """
-    category_risk = {}
-
-    for commit in commits:
-        category = commit.get('category', 'other')
-
-        if category not in category_risk:
-            category_risk[category] = {
-                'count': 0,
-                'breaking': 0,
-                'customer_impact': 0,
-                'large': 0,
-            }
-
-        category_risk[category]['count'] += 1
-
-        if commit.get('is_breaking'):
-            category_risk[category]['breaking'] += 1
-
-        if commit.get('customer_impacts', {}).get('impact_count', 0) > 0:
-            category_risk[category]['customer_impact'] += 1
-
-        if commit.get('is_large'):
-            category_risk[category]['large'] += 1
-
-    return category_risk
+"""
+Release risk scoring and assessment.
+
+This module calculates risk scores for releases based on:
+- Breaking changes
+- Customer-impacting commits
+- Large commits
+- Test coverage
+- Other quality metrics
+"""
+import bisect
+import logging
+from collections import defaultdict
+from typing import Dict, List, Any, Optional
+
+from .commit_classifier import has_customer_impact
+
+logger = logging.getLogger(__name__)
+
+
+# Risk level thresholds
+RISK_LEVEL_LOW = 3
+RISK_LEVEL_MODERATE = 6
+
+# Minimum score of each level above 'low' (ascending), and the level names;
+# a score maps to the label after the last threshold it reaches
+_LEVEL_THRESHOLDS = (RISK_LEVEL_LOW, RISK_LEVEL_MODERATE)
+_LEVEL_LABELS = ('low', 'moderate', 'high')
+
+# Scoring weights
+BREAKING_CHANGE_POINTS = 2
+CUSTOMER_IMPACT_POINTS = 1
+CUSTOMER_IMPACT_CAP = 3
+LARGE_COMMIT_POINTS = 1
+LOW_COVERAGE_POINTS = 1
+COVERAGE_THRESHOLD = 80.0
+
+
+def new_risk_tally() -> Dict[str, Any]:
+    """
+    Create an empty per-commit risk signal accumulator.
+
+    Feed it with tally_commit_risk() and turn it into an assessment with
+    score_risk_tally(). This lets callers that already walk the commits
+    (e.g. the fused aggregation pass) score risk without another pass.
+
+    Returns:
+        dict with breaking/customer_impact/high_risk_path/large counts and
+        feature/path sets
+    """
+    return {
+        'breaking_count': 0,
+        'customer_impact_count': 0,
+        'high_risk_path_count': 0,
+        'large_count': 0,
+        'features': set(),
+        'paths': set(),
+    }
+
+
+def tally_commit_risk(tally: Dict[str, Any], commit: Dict[str, Any]) -> None:
+    """
+    Add one categorized commit's risk signals to a tally.
+
+    Args:
+        tally: Accumulator from new_risk_tally()
+        commit: Categorized commit
+    """
+    # bool counts as 0/1, so flags are added without a branch
+    tally['breaking_count'] += bool(commit.get('is_breaking'))
+    tally['large_count'] += bool(commit.get('is_large'))
+
+    if has_customer_impact(commit):
+        impacts = commit['customer_impacts']
+        tally['customer_impact_count'] += 1
+        # Sets dedupe features/paths shared by many commits; skip the
+        # update call entirely when a commit matched none
+        matched_features = impacts.get('matched_features')
+        if matched_features:
+            tally['features'].update(matched_features)
+        matched_paths = impacts.get('matched_paths')
+        if matched_paths:
+            tally['high_risk_path_count'] += 1
+            tally['paths'].update(matched_paths)
+
+
+def calculate_release_risk(
+    commits: List[Dict[str, Any]],
+    ci_report: Optional[Dict[str, Any]] = None,
+    customer_watchlist: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Calculate risk score and level for a release.
+
+    Scoring:
+    - +2 per breaking change commit
+    - +1 per customer-impacting commit (capped at +3 total)
+    - +1 per large commit (>500 lines)
+    - +1 if test coverage < 80%
+
+    Risk levels:
+    - low: score < 3
+    - moderate: score 3-5
+    - high: score >= 6
+
+    Args:
+        commits: List of categorized commits
+        ci_report: Optional CI report dict
+        customer_watchlist: Optional customer watchlist dict
+
+    Returns:
+        dict with score, level and factors
+    """
+    # Single pass accumulator - O(n) instead of multiple O(n) passes
+    tally = new_risk_tally()
+    for commit in commits:
+        tally_commit_risk(tally, commit)
+
+    return score_risk_tally(tally, ci_report)
+
+
+def score_risk_tally(
+    tally: Dict[str, Any],
+    ci_report: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Score accumulated commit risk signals plus CI quality into a risk assessment.
+
+    See calculate_release_risk() for the scoring rules.
+
+    Args:
+        tally: Accumulator filled by tally_commit_risk()
+        ci_report: Optional CI report dict
+
+    Returns:
+        dict with score, level and factors
+    """
+    score = 0
+    factors = []
+
+    # Pull the CI report sections apart once; a missing report or section
+    # reads as empty
+    ci_report = ci_report or {}
+    coverage_data = ci_report.get('coverage') or {}
+    line_coverage = coverage_data.get('line_percent')
+    previous_coverage = (coverage_data.get('previous') or {}).get('line_percent')
+    failed_tests = (ci_report.get('test_summary') or {}).get('failed', 0)
+
+    breaking_count = tally['breaking_count']
+    customer_impact_count = tally['customer_impact_count']
+    large_count = tally['large_count']
+    all_features = tally['features']
+    all_paths = tally['paths']
+
+    # Add factors based on counts
+    if breaking_count > 0:
+        points = breaking_count * BREAKING_CHANGE_POINTS
+        score += points
+        factors.append({
+            'reason': f'{breaking_count} breaking change commit(s)',
+            'points': points,
+            'severity': 'high'
+        })
+
+    if customer_impact_count > 0:
+        # Cap at CUSTOMER_IMPACT_CAP points
+        points = min(customer_impact_count * CUSTOMER_IMPACT_POINTS, CUSTOMER_IMPACT_CAP)
+        score += points
+        factors.append({
+            'reason': f'{customer_impact_count} customer-impacting commit(s)',
+            'points': points,
+            'severity': 'medium'
+        })
+
+        if all_features:
+            factors.append({
+                'reason': f'Impacts features: {", ".join(sorted(all_features))}',
+                'points': 0,
+                'severity': 'info'
+            })
+        if all_paths:
+            factors.append({
+                'reason': f'Changes in high-risk paths: {", ".join(sorted(all_paths))}',
+                'points': 0,
+                'severity': 'info'
+            })
+
+    if large_count > 0:
+        points = large_count * LARGE_COMMIT_POINTS
+        score += points
+        factors.append({
+            'reason': f'{large_count} large commit(s) (>500 lines)',
+            'points': points,
+            'severity': 'low'
+        })
+
+    # Check test coverage
+    if line_coverage is not None:
+        if line_coverage < COVERAGE_THRESHOLD:
+            points = LOW_COVERAGE_POINTS
+            score += points
+            factors.append({
+                'reason': f'Test coverage below threshold ({line_coverage:.1f}% < {COVERAGE_THRESHOLD}%)',
+                'points': points,
+                'severity': 'medium'
+            })
+
+        # Also note coverage drops
+        if previous_coverage is not None:
+            coverage_drop = previous_coverage - line_coverage
+            if coverage_drop > 5:
+                factors.append({
+                    'reason': f'Coverage dropped {coverage_drop:.1f}% ({previous_coverage:.1f}% → {line_coverage:.1f}%)',
+                    'points': 0,
+                    'severity': 'warning'
+                })
+
+    # Check for failed tests (informational only, no points)
+    if failed_tests > 0:
+        factors.append({
+            'reason': f'{failed_tests} test(s) failing',
+            'points': 0,
+            'severity': 'critical'
+        })
+
+    # Determine risk level
+    level = _LEVEL_LABELS[bisect.bisect_right(_LEVEL_THRESHOLDS, score)]
+
+    logger.info(f"Calculated release risk: {level} (score: {score})")
+
+    return {
+        'score': score,
+        'level': level,
+        'factors': factors
+    }
+
+
+def get_risk_recommendations(
+    risk_assessment: Dict[str, Any],
+    commits: List[Dict[str, Any]],
+    ci_report: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Generate actionable recommendations based on risk assessment.
+
+    Args:
+        risk_assessment: Risk assessment dict from calculate_release_risk
+        commits: List of categorized commits
+        ci_report: Optional CI report dict
+
+    Returns:
+        List of recommendation strings
+    """
+    recommendations = []
+    level = risk_assessment['level']
+
+    # Count every signal in one pass, without building filtered sublists
+    tally = new_risk_tally()
+    for commit in commits:
+        tally_commit_risk(tally, commit)
+
+    breaking_count = tally['breaking_count']
+    customer_impact_count = tally['customer_impact_count']
+    high_risk_path_count = tally['high_risk_path_count']
+    large_count = tally['large_count']
+
+    # CI report fields, read once; a missing report or section reads as empty
+    ci_report = ci_report or {}
+    failed_tests = (ci_report.get('test_summary') or {}).get('failed', 0)
+    coverage = (ci_report.get('coverage') or {}).get('line_percent')
+
+    # Generate recommendations based on counts
+    if breaking_count > 0:
+        recommendations.append(
+            f'⚠️  Review {breaking_count} breaking change(s) with stakeholders'
+        )
+        recommendations.append(
+            '📝 Update migration guide and changelog with breaking changes'
+        )
+
+    if customer_impact_count > 0:
+        recommendations.append(
+            f'📢 Notify customer success about {customer_impact_count} impactful change(s)'
+        )
+
+    if high_risk_path_count > 0:
+        recommendations.append(
+            '🔍 Extra QA attention on auth, payment, or billing flows'
+        )
+
+    if large_count > 0:
+        recommendations.append(
+            f'👀 Manual review of {large_count} large commit(s) for hidden issues'
+        )
+
+    # CI issues
+    if failed_tests > 0:
+        recommendations.append(
+            f'🚨 Fix {failed_tests} failing test(s) before release'
+        )
+
+    if coverage and coverage < COVERAGE_THRESHOLD:
+        recommendations.append(
+            f'📊 Improve test coverage (currently {coverage:.1f}%, target {COVERAGE_THRESHOLD}%)'
+        )
+
+    # General recommendations based on risk level
+    if level == 'high':
+        recommendations.append(
+            '⏸️  Consider splitting this release into smaller, lower-risk releases'
+        )
+        recommendations.append(
+            '🎯 Use feature flags for gradual rollout of high-risk changes'
+        )
+    elif level == 'moderate':
+        recommendations.append(
+            '✅ Standard QA process with extra attention to flagged areas'
+        )
+
+    return recommendations
+
+
+def summarize_risk_by_category(commits: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize risk factors by commit category.
+
+    Args:
+        commits: List of categorized commits
+
+    Returns:
+        dict with risk breakdown by category
+    """
+    category_risk = defaultdict(_new_category_risk)
+
+    for commit in commits:
+        entry = category_risk[commit.get('category', 'other')]
+        entry['count'] += 1
+        entry['breaking'] += bool(commit.get('is_breaking'))
+        entry['customer_impact'] += bool(has_customer_impact(commit))
+        entry['large'] += bool(commit.get('is_large'))
+
+    return dict(category_risk)
+
+
+def _new_category_risk() -> Dict[str, int]:
+    """Create an empty per-category risk counter for summarize_risk_by_category."""
+    return {
+        'count': 0,
+        'breaking': 0,
+        'customer_impact': 0,
+        'large': 0,
+    }
@@ -1,198 +1,301 @@
-"""
-Tool implementations for Release Notes MCP server.
-
-This module contains implementations for the three main tools:
-- get_git_history: Fetch git commit history between refs
-- get_ci_report: Load CI/CD test report from JSON
-- get_customer_watchlist: Load customer watchlist from JSON
-"""
-import logging
-from typing import Any, Dict, List, Optional
-
-from . import git_tools
-from . import file_utils
-
-logger = logging.getLogger(__name__)
-
-
-def get_git_history(
-    from_ref: str,
-    to_ref: str,
-    include_diffs: bool = False,
-    max_commits: int = 200
-) -> Dict[str, Any]:
-    """
-    Fetch git commit history between two refs.
-
-    This function uses real git operations to:
-    - Validate git repository exists
-    - Resolve refs to SHAs
-    - Check commit count and enforce max_commits
-    - Run git log with appropriate format
-    - Parse output into structured JSON
-    - Handle errors (invalid refs, timeouts, etc.)
-
-    Args:
-        from_ref: Starting git ref (tag, branch, SHA)
-        to_ref: Ending git ref (tag, branch, SHA)
-        include_diffs: Include full patch diffs (default: False)
-        max_commits: Maximum commits to return (default: 200)
-
-    Returns:
-        Dictionary containing:
-        - from_ref, to_ref: Original inputs
-        - from_sha, to_sha: Resolved SHAs
-        - commits: List of commit objects with metadata and file changes
-        - stats: Aggregate statistics
-        - warnings: List of warnings (e.g., commit limit reached)
-
-    Raises:
-        GitRepoNotFoundError: If not in a git repository
-        InvalidRefError: If ref doesn't exist
-        EmptyCommitRangeError: If no commits between refs
-        CommitLimitExceededError: If commits > max_commits and not allowed
-        GitOperationTimeoutError: If git operation times out
-    """
-    logger.info(
-        f"get_git_history called: {from_ref}..{to_ref} "
-        f"(include_diffs={include_diffs}, max_commits={max_commits})"
-    )
-
-    # Use real git operations
-    return git_tools.get_git_history_data(
-        from_ref=from_ref,
-        to_ref=to_ref,
-        include_diffs=include_diffs,
-        max_commits=max_commits,
-        cwd="."
-    )
-
-
-def get_ci_report(report_path: str = "./ci_report.json") -> Optional[Dict[str, Any]]:
-    """
-    Load and parse CI/CD test report from JSON file.
-
-    Args:
-        report_path: Path to CI report JSON file (default: ./ci_report.json)
-
-    Returns:
-        Dictionary containing:
-        - test_summary: Total, passed, failed, skipped counts
-        - coverage: Line and branch coverage percentages
-        - failed_tests: List of failed test details
-        - build_status: success/failed/unstable/unknown
-        - duration_seconds: Test execution time
-        - metadata: Optional build info
-
-        Returns None if file doesn't exist (graceful degradation).
-
-    Raises:
-        InvalidJSONFileError: If file exists but contains invalid JSON
-    """
-    logger.info(f"get_ci_report called: {report_path}")
-
-    return file_utils.load_ci_report(report_path)
-
-
-def get_customer_watchlist(
-    watchlist_path: str = "./customer_watchlist.json"
-) -> Dict[str, Any]:
-    """
-    Load customer watchlist with critical accounts and features.
-
-    Args:
-        watchlist_path: Path to watchlist JSON file (default: ./customer_watchlist.json)
-
-    Returns:
-        Dictionary containing:
-        - critical_customers: List of important customer IDs
-        - watched_features: List of high-visibility features
-        - breaking_change_keywords: Keywords that signal breaking changes
-        - high_risk_paths: File paths that are high-risk
-        - migration_patterns: Patterns for database migrations
-
-        Always returns valid structure (uses defaults if file missing).
-
-    Raises:
-        InvalidJSONFileError: If file exists but contains invalid JSON
-    """
-    logger.info(f"get_customer_watchlist called: {watchlist_path}")
-
-    return file_utils.load_customer_watchlist(watchlist_path)
-
-
-def register_tools(server: Any) -> None:
-    """
-    Register all tools with the MCP server.
-
-    Args:
-        server: ReleaseNotesServer instance
-    """
-    # Tool 1: get_git_history
-    server.register_tool(
-        name="get_git_history",
-        description="Fetch git commit history between two refs with file change statistics",
-        input_schema={
-            "type": "object",
-            "properties": {
-                "from_ref": {
-                    "type": "string",
-                    "description": "Starting git ref (tag, branch, SHA)"
-                },
-                "to_ref": {
-                    "type": "string",
-                    "description": "Ending git ref (tag, branch, SHA)"
-                },
-                "include_diffs": {
-                    "type": "boolean",
-                    "description": "Include full patch diffs (warning: expensive for large ranges)",
-                    "default": False
-                },
-                "max_commits": {
-                    "type": "integer",
-                    "description": "Maximum commits to return (default 200, prevents runaway queries)",
-                    "default": 200
-                }
-            },
-            "required": ["from_ref", "to_ref"]
-        },
-        handler=get_git_history
-    )
-
-    # Tool 2: get_ci_report
-    server.register_tool(
-        name="get_ci_report",
-        description="Load and parse CI/CD test report from JSON file",
-        input_schema={
-            "type": "object",
-            "properties": {
-                "report_path": {
-                    "type": "string",
-                    "description": "Path to CI report JSON file",
-                    "default": "./ci_report.json"
-                }
-            },
-            "required": []
-        },
-        handler=get_ci_report
-    )
-
-    # Tool 3: get_customer_watchlist
-    server.register_tool(
-        name="get_customer_watchlist",
-        description="Load customer watchlist with critical accounts and features",
-        input_schema={
-            "type": "object",
-            "properties": {
-                "watchlist_path": {
-                    "type": "string",
-                    "description": "Path to customer watchlist JSON file",
-                    "default": "./customer_watchlist.json"
-                }
-            },
-            "required": []
-        },
-        handler=get_customer_watchlist
-    )
-
-    logger.info("All tools registered successfully")
+"""
+Tool implementations for Release Notes MCP server.
+
+This module contains implementations for the main tools:
+- get_git_history: Fetch git commit history between refs
+- get_commit_patch: Fetch the patch of a single commit on demand
+- get_ci_report: Load CI/CD test report from JSON
+- get_customer_watchlist: Load customer watchlist from JSON
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from . import git_tools
+from . import file_utils
+
+logger = logging.getLogger(__name__)
+
+# Abbreviated SHA length used by get_git_history(compact=True)
+COMPACT_SHA_LENGTH = 12
+
+
+def get_git_history(
+    from_ref: str,
+    to_ref: str,
+    include_diffs: bool = False,
+    max_commits: int = 200,
+    compact: bool = False,
+    cursor: int = 0
+) -> Dict[str, Any]:
+    """
+    Fetch git commit history between two refs.
+
+    This function uses real git operations to:
+    - Validate git repository exists
+    - Resolve refs to SHAs
+    - Check commit count and enforce max_commits
+    - Run git log with appropriate format
+    - Parse output into structured JSON
+    - Handle errors (invalid refs, timeouts, etc.)
+
+    Args:
+        from_ref: Starting git ref (tag, branch, SHA)
+        to_ref: Ending git ref (tag, branch, SHA)
+        include_diffs: Accepted for compatibility and ignored; commits never
+            carry patch text (fetch it per commit with get_commit_patch)
+        max_commits: Maximum commits to return (default: 200)
+        compact: Shrink each commit for the wire: author becomes
+            "Name <email>" (no separate email) and sha is cut to
+            COMPACT_SHA_LENGTH characters (default: False)
+        cursor: Page offset from a previous result's next_cursor (default: 0)
+
+    Returns:
+        Dictionary containing:
+        - from_ref, to_ref: Original inputs
+        - from_sha, to_sha: Resolved SHAs
+        - commits: List of commit objects with metadata and file changes
+        - stats: Aggregate statistics
+        - warnings: List of warnings (e.g., commit limit reached)
+        - next_cursor: Cursor for the next page when max_commits truncated
+          the range, else None
+
+    Raises:
+        GitRepoNotFoundError: If not in a git repository
+        InvalidRefError: If ref doesn't exist
+        EmptyCommitRangeError: If no commits between refs
+        CommitLimitExceededError: If commits > max_commits and not allowed
+        GitOperationTimeoutError: If git operation times out
+    """
+    logger.info(
+        "get_git_history called: %s..%s (max_commits=%s)",
+        from_ref, to_ref, max_commits
+    )
+
+    # Use real git operations
+    history = git_tools.get_git_history_data(
+        from_ref=from_ref,
+        to_ref=to_ref,
+        max_commits=max_commits,
+        cwd=".",
+        cursor=cursor
+    )
+
+    if compact:
+        _compact_commits(history["commits"])
+
+    return history
+
+
+def _compact_commits(commits: List[Dict[str, Any]]) -> None:
+    """
+    Merge author/email and abbreviate SHAs in place (see get_git_history).
+
+    Args:
+        commits: Commit dicts from git_tools.get_git_history_data
+    """
+    for commit in commits:
+        email = commit.pop("email", "")
+        if email:
+            commit["author"] = f"{commit['author']} <{email}>"
+        commit["sha"] = commit["sha"][:COMPACT_SHA_LENGTH]
+
+
+def get_commit_patch(sha: str) -> Dict[str, Any]:
+    """
+    Fetch the patch introduced by a single commit.
+
+    get_git_history only returns per-file statistics; this fetches the
+    patch text for the commits that actually need it.
+
+    Args:
+        sha: Commit SHA (or any ref naming a commit)
+
+    Returns:
+        Dictionary containing:
+        - sha: Full SHA of the commit the input resolved to
+        - patch: Patch text (empty for commits without content changes)
+
+    Raises:
+        GitRepoNotFoundError: If not in a git repository
+        InvalidRefError: If the commit doesn't exist
+        GitOperationTimeoutError: If git operation times out
+    """
+    logger.info("get_commit_patch called: %s", sha)
+
+    # Validates the client value (option-like or unknown refs are rejected);
+    # the full SHA is served from the ref cache inside get_commit_diff
+    commit_sha = git_tools.resolve_ref(sha, cwd=".")
+
+    return {
+        "sha": commit_sha,
+        "patch": git_tools.get_commit_diff(commit_sha, cwd=".")
+    }
+
+
+def get_ci_report(report_path: str = "./ci_report.json") -> Optional[Dict[str, Any]]:
+    """
+    Load and parse CI/CD test report from JSON file.
+
+    Args:
+        report_path: Path to CI report JSON file (default: ./ci_report.json)
+
+    Returns:
+        Dictionary containing:
+        - test_summary: Total, passed, failed, skipped counts
+        - coverage: Line and branch coverage percentages
+        - failed_tests: List of failed test details
+        - build_status: success/failed/unstable/unknown
+        - duration_seconds: Test execution time
+        - metadata: Optional build info
+
+        Returns None if file doesn't exist (graceful degradation).
+
+    Raises:
+        InvalidJSONFileError: If file exists but contains invalid JSON
+    """
+    logger.info("get_ci_report called: %s", report_path)
+
+    return file_utils.load_ci_report(report_path)
+
+
+def get_customer_watchlist(
+    watchlist_path: str = "./customer_watchlist.json"
+) -> Dict[str, Any]:
+    """
+    Load customer watchlist with critical accounts and features.
+
+    Args:
+        watchlist_path: Path to watchlist JSON file (default: ./customer_watchlist.json)
+
+    Returns:
+        Dictionary containing:
+        - critical_customers: List of important customer IDs
+        - watched_features: List of high-visibility features
+        - breaking_change_keywords: Keywords that signal breaking changes
+        - high_risk_paths: File paths that are high-risk
+        - migration_patterns: Patterns for database migrations
+
+        Always returns valid structure (uses defaults if file missing).
+
+    Raises:
+        InvalidJSONFileError: If file exists but contains invalid JSON
+    """
+    logger.info("get_customer_watchlist called: %s", watchlist_path)
+
+    return file_utils.load_customer_watchlist(watchlist_path)
+
+
+# Tool input schemas, built once at import. They are shared with the
+# server's tool registry and returned as-is by tools/list, so treat them
+# as read-only
+_GIT_HISTORY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "from_ref": {
+            "type": "string",
+            "description": "Starting git ref (tag, branch, SHA)"
+        },
+        "to_ref": {
+            "type": "string",
+            "description": "Ending git ref (tag, branch, SHA)"
+        },
+        "include_diffs": {
+            "type": "boolean",
+            "description": "Deprecated, has no effect: commits never include patch text (use get_commit_patch)",
+            "default": False
+        },
+        "max_commits": {
+            "type": "integer",
+            "description": "Maximum commits to return (default 200, prevents runaway queries)",
+            "default": 200
+        },
+        "compact": {
+            "type": "boolean",
+            "description": "Smaller commit records: author as 'Name <email>' without a separate email field, 12-character SHAs",
+            "default": False
+        },
+        "cursor": {
+            "type": "integer",
+            "description": "Continue a truncated history: pass the previous result's next_cursor",
+            "default": 0
+        }
+    },
+    "required": ["from_ref", "to_ref"]
+}
+
+_COMMIT_PATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sha": {
+            "type": "string",
+            "description": "Commit SHA (or ref) to fetch the patch for"
+        }
+    },
+    "required": ["sha"]
+}
+
+_CI_REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "report_path": {
+            "type": "string",
+            "description": "Path to CI report JSON file",
+            "default": "./ci_report.json"
+        }
+    },
+    "required": []
+}
+
+_CUSTOMER_WATCHLIST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "watchlist_path": {
+            "type": "string",
+            "description": "Path to customer watchlist JSON file",
+            "default": "./customer_watchlist.json"
+        }
+    },
+    "required": []
+}
+
+
+def register_tools(server: Any) -> None:
+    """
+    Register all tools with the MCP server.
+
+    Args:
+        server: ReleaseNotesServer instance
+    """
+    # Tool 1: get_git_history
+    server.register_tool(
+        name="get_git_history",
+        description="Fetch git commit history between two refs with file change statistics",
+        input_schema=_GIT_HISTORY_SCHEMA,
+        handler=get_git_history
+    )
+
+    # Tool 2: get_commit_patch
+    server.register_tool(
+        name="get_commit_patch",
+        description="Fetch the patch (diff) introduced by a single commit",
+        input_schema=_COMMIT_PATCH_SCHEMA,
+        handler=get_commit_patch
+    )
+
+    # Tool 3: get_ci_report
+    server.register_tool(
+        name="get_ci_report",
+        description="Load and parse CI/CD test report from JSON file",
+        input_schema=_CI_REPORT_SCHEMA,
+        handler=get_ci_report
+    )
+
+    # Tool 4: get_customer_watchlist
+    server.register_tool(
+        name="get_customer_watchlist",
+        description="Load customer watchlist with critical accounts and features",
+        input_schema=_CUSTOMER_WATCHLIST_SCHEMA,
+        handler=get_customer_watchlist
+    )
+
+    logger.info("All tools registered successfully")
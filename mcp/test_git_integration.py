@@ -1,256 +1,506 @@
-#!/usr/bin/env python3
-"""
-Integration tests for git operations.
-
-Tests the real git integration using the current repository.
-"""
-import sys
-import json
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from mcp.release_notes_server import git_tools
-from mcp.release_notes_server.errors import (
-    GitRepoNotFoundError,
-    InvalidRefError,
-    EmptyCommitRangeError,
-)
-
-
-def test_is_git_repository():
-    """Test git repository detection."""
-    print("Testing is_git_repository...")
-
-    # Current directory should be a git repo
-    assert git_tools.is_git_repository("."), "Current directory should be a git repo"
-
-    # /tmp should not be a git repo
-    assert not git_tools.is_git_repository("/tmp"), "/tmp should not be a git repo"
-
-    print("✓ is_git_repository test passed")
-
-
-def test_resolve_ref():
-    """Test ref resolution."""
-    print("Testing resolve_ref...")
-
-    # Resolve HEAD
-    sha = git_tools.resolve_ref("HEAD")
-    assert len(sha) == 40, f"SHA should be 40 chars, got {len(sha)}"
-    assert sha.isalnum(), "SHA should be alphanumeric"
-    print(f"  HEAD -> {sha[:8]}...")
-
-    # Test invalid ref
-    try:
-        git_tools.resolve_ref("nonexistent-ref-12345")
-        assert False, "Should have raised InvalidRefError"
-    except InvalidRefError as e:
-        print(f"  Invalid ref correctly raised: {e.message}")
-
-    print("✓ resolve_ref test passed")
-
-
-def test_get_commit_count():
-    """Test commit counting."""
-    print("Testing get_commit_count...")
-
-    # Count commits from HEAD~2 to HEAD
-    try:
-        count = git_tools.get_commit_count("HEAD~2", "HEAD")
-        print(f"  HEAD~2..HEAD: {count} commits")
-        assert count >= 0 and count <= 2, f"Expected 0-2 commits, got {count}"
-    except (EmptyCommitRangeError, InvalidRefError):
-        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
-
-    # get_commit_count returns 0 for empty ranges (not an error at this level)
-    count = git_tools.get_commit_count("HEAD", "HEAD")
-    assert count == 0, f"Empty range should have 0 commits, got {count}"
-    print("  HEAD..HEAD: 0 commits (as expected)")
-
-    print("✓ get_commit_count test passed")
-
-
-def test_run_git_log():
-    """Test git log execution."""
-    print("Testing run_git_log...")
-
-    # Get log from HEAD~2 to HEAD
-    try:
-        output = git_tools.run_git_log("HEAD~2", "HEAD", include_diffs=False, max_commits=10)
-        assert isinstance(output, str), "Output should be string"
-        assert len(output) > 0, "Output should not be empty"
-        print(f"  Got {len(output)} bytes of output")
-    except (EmptyCommitRangeError, InvalidRefError):
-        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
-
-    print("✓ run_git_log test passed")
-
-
-def test_parse_git_log_output():
-    """Test git log parsing."""
-    print("Testing parse_git_log_output...")
-
-    # Get real git log output and parse it
-    try:
-        raw_output = git_tools.run_git_log("HEAD~2", "HEAD", include_diffs=False, max_commits=10)
-        parsed = git_tools.parse_git_log_output(raw_output, "HEAD~2", "HEAD")
-
-        assert "commits" in parsed, "Should have commits key"
-        assert "stats" in parsed, "Should have stats key"
-
-        commits = parsed["commits"]
-        stats = parsed["stats"]
-
-        print(f"  Parsed {len(commits)} commits")
-
-        if commits:
-            # Check first commit structure
-            commit = commits[0]
-            assert "sha" in commit, "Commit should have sha"
-            assert "author" in commit, "Commit should have author"
-            assert "email" in commit, "Commit should have email"
-            assert "timestamp" in commit, "Commit should have timestamp"
-            assert "date" in commit, "Commit should have date"
-            assert "subject" in commit, "Commit should have subject"
-            assert "files_changed" in commit, "Commit should have files_changed"
-
-            print(f"  First commit: {commit['sha'][:8]} - {commit['subject'][:50]}")
-            print(f"  Author: {commit['author']} <{commit['email']}>")
-            print(f"  Files changed: {len(commit['files_changed'])}")
-
-        # Check stats
-        assert stats["total_commits"] == len(commits), "Stats should match commit count"
-        print(f"  Total insertions: {stats['total_insertions']}")
-        print(f"  Total deletions: {stats['total_deletions']}")
-        print(f"  Authors: {', '.join(stats['authors'])}")
-
-    except (EmptyCommitRangeError, InvalidRefError):
-        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
-
-    print("✓ parse_git_log_output test passed")
-
-
-def test_get_git_history_data():
-    """Test complete git history retrieval."""
-    print("Testing get_git_history_data...")
-
-    try:
-        # Get history from HEAD~2 to HEAD
-        data = git_tools.get_git_history_data(
-            from_ref="HEAD~2",
-            to_ref="HEAD",
-            include_diffs=False,
-            max_commits=10
-        )
-
-        # Validate structure
-        assert "from_ref" in data
-        assert "to_ref" in data
-        assert "from_sha" in data
-        assert "to_sha" in data
-        assert "commits" in data
-        assert "stats" in data
-        assert "warnings" in data
-
-        print(f"  Range: {data['from_ref']}..{data['to_ref']}")
-        print(f"  From SHA: {data['from_sha'][:8]}...")
-        print(f"  To SHA: {data['to_sha'][:8]}...")
-        print(f"  Commits: {data['stats']['total_commits']}")
-        print(f"  Warnings: {len(data['warnings'])}")
-
-        if data["warnings"]:
-            for warning in data["warnings"]:
-                print(f"    - {warning}")
-
-        # Print JSON summary
-        print(f"\n  Summary JSON:")
-        summary = {
-            "commits": data["stats"]["total_commits"],
-            "files_changed": data["stats"]["total_files_changed"],
-            "insertions": data["stats"]["total_insertions"],
-            "deletions": data["stats"]["total_deletions"],
-            "authors": data["stats"]["authors"]
-        }
-        print(f"  {json.dumps(summary, indent=2)}")
-
-    except (EmptyCommitRangeError, InvalidRefError):
-        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
-
-    print("✓ get_git_history_data test passed")
-
-
-def test_error_handling():
-    """Test error handling."""
-    print("Testing error handling...")
-
-    # Test invalid ref
-    try:
-        git_tools.get_git_history_data("invalid-ref-xyz", "HEAD")
-        assert False, "Should raise InvalidRefError"
-    except InvalidRefError as e:
-        print(f"  ✓ Invalid ref error: {e.data}")
-
-    # Test empty range
-    try:
-        git_tools.get_git_history_data("HEAD", "HEAD")
-        assert False, "Should raise EmptyCommitRangeError"
-    except EmptyCommitRangeError as e:
-        print(f"  ✓ Empty range error: {e.data}")
-
-    # Test not a git repo (in /tmp)
-    try:
-        git_tools.get_git_history_data("HEAD~5", "HEAD", cwd="/tmp")
-        assert False, "Should raise GitRepoNotFoundError"
-    except GitRepoNotFoundError as e:
-        print(f"  ✓ Not a git repo error: {e.data}")
-
-    print("✓ error_handling test passed")
-
-
-def main():
-    """Run all tests."""
-    print("=" * 60)
-    print("Git Integration Tests")
-    print("=" * 60)
-    print()
-
-    tests = [
-        test_is_git_repository,
-        test_resolve_ref,
-        test_get_commit_count,
-        test_run_git_log,
-        test_parse_git_log_output,
-        test_get_git_history_data,
-        test_error_handling,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-            print()
-        except AssertionError as e:
-            print(f"✗ Test failed: {e}")
-            failed += 1
-            print()
-        except Exception as e:
-            print(f"✗ Test error: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-            print()
-
-    print("=" * 60)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return 0 if failed == 0 else 1
-
-
-if __name__ == "__main__":
-    sys.exit(main())
+#!/usr/bin/env python3
+"""
+Integration tests for git operations.
+
+Tests the real git integration using the current repository.
+"""
+import os
+import sys
+import json
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mcp.release_notes_server import git_tools
+from mcp.release_notes_server.errors import (
+    GitRepoNotFoundError,
+    InvalidRefError,
+    EmptyCommitRangeError,
+)
+
+
+def test_is_git_repository():
+    """Test git repository detection."""
+    print("Testing is_git_repository...")
+
+    # Current directory should be a git repo
+    assert git_tools.is_git_repository("."), "Current directory should be a git repo"
+
+    # /tmp should not be a git repo
+    assert not git_tools.is_git_repository("/tmp"), "/tmp should not be a git repo"
+
+    # Sub-directories fall back to asking git
+    repo_root = Path(__file__).parent.parent
+    assert git_tools.is_git_repository(str(repo_root / "mcp")), "Sub-directory should be in the repo"
+
+    print("✓ is_git_repository test passed")
+
+
+def test_resolve_ref():
+    """Test ref resolution."""
+    print("Testing resolve_ref...")
+
+    # Resolve HEAD
+    sha = git_tools.resolve_ref("HEAD")
+    assert len(sha) == 40, f"SHA should be 40 chars, got {len(sha)}"
+    assert sha.isalnum(), "SHA should be alphanumeric"
+    print(f"  HEAD -> {sha[:8]}...")
+
+    # Test invalid ref
+    try:
+        git_tools.resolve_ref("nonexistent-ref-12345")
+        assert False, "Should have raised InvalidRefError"
+    except InvalidRefError as e:
+        print(f"  Invalid ref correctly raised: {e.message}")
+
+    # Repeated full-SHA lookups are served from the cache without running git
+    git_tools.clear_git_cache()
+    assert git_tools.resolve_ref(sha) == sha
+    original_run = git_tools.subprocess.run
+    git_tools.subprocess.run = None  # any git call would now fail
+    try:
+        assert git_tools.resolve_ref(sha) == sha
+    except TypeError:
+        assert False, "Cached lookup should not run git"
+    finally:
+        git_tools.subprocess.run = original_run
+    git_tools.clear_git_cache()
+    print("  ✓ Full SHA resolution cached")
+
+    # Symbolic refs are resolved afresh, so a moved HEAD is never stale
+    with tempfile.TemporaryDirectory() as repo:
+        def commit(message):
+            subprocess.run(
+                ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+                 "commit", "-q", "--allow-empty", "-m", message],
+                cwd=repo, check=True
+            )
+
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        commit("first")
+        first = git_tools.resolve_ref("HEAD", cwd=repo)
+        commit("second")
+        assert git_tools.resolve_ref("HEAD", cwd=repo) != first
+    git_tools.clear_git_cache()
+    print("  ✓ Symbolic refs not cached")
+
+    # A range resolves both ends with one git call and names the bad end
+    calls = []
+    original_run = git_tools.subprocess.run
+    def counting_run(*args, **kwargs):
+        calls.append(args[0])
+        return original_run(*args, **kwargs)
+    git_tools.subprocess.run = counting_run
+    try:
+        from_sha, to_sha = git_tools._resolve_ref_range("HEAD~1", "HEAD")
+        assert to_sha == sha and from_sha != sha
+        assert len(calls) == 1, f"Expected one git call, got {len(calls)}"
+    finally:
+        git_tools.subprocess.run = original_run
+    for bad_range in (("HEAD", "nonexistent-ref-12345"), ("HEAD", "HEAD^{tree}")):
+        try:
+            git_tools._resolve_ref_range(*bad_range)
+            assert False, "Should have raised InvalidRefError"
+        except InvalidRefError as e:
+            assert f"'{bad_range[1]}'" in e.data, e.data
+    print("  ✓ Range resolved in one call")
+
+    print("✓ resolve_ref test passed")
+
+
+def test_get_commit_count():
+    """Test commit counting."""
+    print("Testing get_commit_count...")
+
+    # Count commits from HEAD~2 to HEAD
+    try:
+        count = git_tools.get_commit_count("HEAD~2", "HEAD")
+        print(f"  HEAD~2..HEAD: {count} commits")
+        assert count >= 0 and count <= 2, f"Expected 0-2 commits, got {count}"
+    except (EmptyCommitRangeError, InvalidRefError):
+        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
+
+    # get_commit_count returns 0 for empty ranges (not an error at this level)
+    count = git_tools.get_commit_count("HEAD", "HEAD")
+    assert count == 0, f"Empty range should have 0 commits, got {count}"
+    print("  HEAD..HEAD: 0 commits (as expected)")
+
+    print("✓ get_commit_count test passed")
+
+
+def test_run_git_log():
+    """Test git log execution."""
+    print("Testing run_git_log...")
+
+    # Get log from HEAD~2 to HEAD
+    try:
+        output = git_tools.run_git_log("HEAD~2", "HEAD", max_commits=10)
+        assert isinstance(output, str), "Output should be string"
+        assert len(output) > 0, "Output should not be empty"
+        print(f"  Got {len(output)} bytes of output")
+    except (EmptyCommitRangeError, InvalidRefError):
+        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
+
+    print("✓ run_git_log test passed")
+
+
+def test_parse_git_log_output():
+    """Test git log parsing."""
+    print("Testing parse_git_log_output...")
+
+    # Get real git log output and parse it
+    try:
+        raw_output = git_tools.run_git_log("HEAD~2", "HEAD", max_commits=10)
+        parsed = git_tools.parse_git_log_output(raw_output, "HEAD~2", "HEAD")
+
+        assert "commits" in parsed, "Should have commits key"
+        assert "stats" in parsed, "Should have stats key"
+
+        commits = parsed["commits"]
+        stats = parsed["stats"]
+
+        print(f"  Parsed {len(commits)} commits")
+
+        if commits:
+            # Check first commit structure
+            commit = commits[0]
+            assert "sha" in commit, "Commit should have sha"
+            assert "author" in commit, "Commit should have author"
+            assert "email" in commit, "Commit should have email"
+            assert "timestamp" in commit, "Commit should have timestamp"
+            assert "date" in commit, "Commit should have date"
+            assert "subject" in commit, "Commit should have subject"
+            assert "files_changed" in commit, "Commit should have files_changed"
+
+            print(f"  First commit: {commit['sha'][:8]} - {commit['subject'][:50]}")
+            print(f"  Author: {commit['author']} <{commit['email']}>")
+            print(f"  Files changed: {len(commit['files_changed'])}")
+
+        # Check stats
+        assert stats["total_commits"] == len(commits), "Stats should match commit count"
+        print(f"  Total insertions: {stats['total_insertions']}")
+        print(f"  Total deletions: {stats['total_deletions']}")
+        print(f"  Authors: {', '.join(stats['authors'])}")
+
+    except (EmptyCommitRangeError, InvalidRefError):
+        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
+
+    print("✓ parse_git_log_output test passed")
+
+
+def test_parse_git_log_output_records():
+    """Test parsing of NUL-delimited git log records."""
+    print("Testing parse_git_log_output record format...")
+
+    raw_output = (
+        "\x1e" + "a" * 40 + "\x00Jane\x00jane@example.com\x001705314600\x00"
+        "feat: rename module\x00Details ||| with pipes\n\nBREAKING CHANGE: moved\n\x00"
+        "\x00\n:100644 100644 1111111 2222222 M\x00src/app.py\x00"
+        ":000000 100644 0000000 3333333 A\x00assets/logo.png\x00"
+        ":100644 100644 4444444 4444444 R100\x00src/old_name.py\x00src/new_name.py\x00"
+        "12\t3\tsrc/app.py\x00-\t-\tassets/logo.png\x00"
+        "0\t0\t\x00src/old_name.py\x00src/new_name.py\x00"
+        "\x1e" + "b" * 40 + "\x00John\x00john@example.com\x001705228200\x00"
+        "chore: empty commit\x00\x00"
+    )
+
+    parsed = git_tools.parse_git_log_output(raw_output, "v1", "v2")
+    commits = parsed["commits"]
+    assert len(commits) == 2
+
+    first = commits[0]
+    assert first["sha"] == "a" * 40
+    assert first["author"] == "Jane"
+    assert first["date"] == "2024-01-15T10:30:00Z"
+    assert first["body"] == "Details ||| with pipes\n\nBREAKING CHANGE: moved"
+    assert [f["path"] for f in first["files_changed"]] == [
+        "src/app.py", "assets/logo.png", "src/new_name.py"
+    ]
+    assert first["files_changed"][0]["insertions"] == 12
+    assert first["files_changed"][0]["deletions"] == 3
+    assert first["files_changed"][1]["insertions"] == 0  # binary
+    assert [f["status"] for f in first["files_changed"]] == ["modified", "added", "renamed"]
+    print("  ✓ Multi-line body, binary file and rename parsed")
+
+    assert commits[1]["files_changed"] == []
+    assert parsed["stats"]["total_commits"] == 2
+    assert parsed["stats"]["total_files_changed"] == 3
+    assert parsed["stats"]["total_insertions"] == 12
+    assert parsed["stats"]["authors"] == ["Jane", "John"]
+    print("  ✓ Empty commit and stats parsed")
+
+    # RS inside commit content (even a field that looks like a commit start)
+    # and inside patch text must not split a commit
+    fake_start = "\x1e" + "c" * 40
+    raw_output = (
+        "\x1e" + "a" * 40 + "\x00Ev\x1eil\x00e@example.com\x001705314600\x00"
+        + fake_start + "\x00" + fake_start + "\x00"
+        "\x00\n:000000 100644 0000000 3333333 A\x00" + fake_start + "\x00"
+        "1\t0\t" + fake_start + "\x00"
+        "\x00diff --git a/x b/x\n+\x1e" + "d" * 40 + "\n"
+        "\x1e" + "b" * 40 + "\x00John\x00john@example.com\x001705228200\x00"
+        "chore: empty commit\x00\x00"
+    )
+    commits = git_tools.parse_git_log_output(raw_output, "v1", "v2")["commits"]
+    assert [c["sha"] for c in commits] == ["a" * 40, "b" * 40]
+    assert commits[0]["author"] == "Ev\x1eil"
+    # (str.strip treats RS as whitespace, as it always has for these fields)
+    assert commits[0]["subject"] == fake_start.strip()
+    assert commits[0]["body"] == fake_start.strip()
+    assert [f["path"] for f in commits[0]["files_changed"]] == [fake_start]
+    print("  ✓ Record separators inside commit content don't split commits")
+
+    print("✓ parse_git_log_output record format test passed")
+
+
+def test_iter_git_log_records():
+    """Test streaming git log records."""
+    print("Testing iter_git_log_records...")
+
+    try:
+        raw_output = git_tools.run_git_log("HEAD~2", "HEAD", max_commits=10)
+        buffered = git_tools.parse_git_log_output(raw_output, "HEAD~2", "HEAD")
+
+        # Tiny reads force records to span several chunks
+        original_chunk_size = git_tools.STREAM_CHUNK_SIZE
+        git_tools.STREAM_CHUNK_SIZE = 7
+        try:
+            streamed = git_tools.parse_git_log_records(
+                git_tools.iter_git_log_records("HEAD~2", "HEAD", max_commits=10)
+            )
+        finally:
+            git_tools.STREAM_CHUNK_SIZE = original_chunk_size
+
+        assert streamed == buffered, "Streamed parse should match buffered parse"
+        print(f"  ✓ Streamed {len(streamed['commits'])} commits identically")
+    except (EmptyCommitRangeError, InvalidRefError):
+        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
+
+    # Errors surface when the stream is consumed
+    try:
+        list(git_tools.iter_git_log_records("nonexistent-ref-12345", "HEAD"))
+        assert False, "Should have raised InvalidRefError"
+    except InvalidRefError:
+        print("  ✓ Invalid ref raised while streaming")
+
+    print("✓ iter_git_log_records test passed")
+
+
+def test_get_commit_diff():
+    """Test on-demand patch retrieval."""
+    print("Testing get_commit_diff...")
+
+    diff = git_tools.get_commit_diff("HEAD")
+    assert isinstance(diff, str), "Diff should be a string"
+    print(f"  HEAD diff: {len(diff)} chars")
+
+    try:
+        git_tools.get_commit_diff("nonexistent-ref-12345")
+        assert False, "Should have raised InvalidRefError"
+    except InvalidRefError:
+        print("  ✓ Invalid ref raised")
+
+    # A value that looks like an option is rejected, never passed to git
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = os.path.join(tmpdir, "out")
+        try:
+            git_tools.get_commit_diff(f"--output={target}")
+            assert False, "Should have raised InvalidRefError"
+        except InvalidRefError:
+            pass
+        assert not os.path.exists(target), "git must not have written the file"
+    print("  ✓ Option-like value rejected")
+
+    print("✓ get_commit_diff test passed")
+
+
+def test_get_git_history_data():
+    """Test complete git history retrieval."""
+    print("Testing get_git_history_data...")
+
+    try:
+        # Get history from HEAD~2 to HEAD
+        data = git_tools.get_git_history_data(
+            from_ref="HEAD~2",
+            to_ref="HEAD",
+            max_commits=10
+        )
+
+        # Validate structure
+        assert "from_ref" in data
+        assert "to_ref" in data
+        assert "from_sha" in data
+        assert "to_sha" in data
+        assert "commits" in data
+        assert "stats" in data
+        assert "warnings" in data
+
+        print(f"  Range: {data['from_ref']}..{data['to_ref']}")
+        print(f"  From SHA: {data['from_sha'][:8]}...")
+        print(f"  To SHA: {data['to_sha'][:8]}...")
+        print(f"  Commits: {data['stats']['total_commits']}")
+        print(f"  Warnings: {len(data['warnings'])}")
+
+        if data["warnings"]:
+            for warning in data["warnings"]:
+                print(f"    - {warning}")
+
+        # Print JSON summary
+        print(f"\n  Summary JSON:")
+        summary = {
+            "commits": data["stats"]["total_commits"],
+            "files_changed": data["stats"]["total_files_changed"],
+            "insertions": data["stats"]["total_insertions"],
+            "deletions": data["stats"]["total_deletions"],
+            "authors": data["stats"]["authors"]
+        }
+        print(f"  {json.dumps(summary, indent=2)}")
+
+        # Without rename detection renames show up as delete + add
+        plain = git_tools.get_git_history_data("HEAD~2", "HEAD", max_commits=10, detect_renames=False)
+        assert plain["stats"]["total_commits"] == data["stats"]["total_commits"]
+        assert all(
+            f["status"] not in ("renamed", "copied")
+            for commit in plain["commits"] for f in commit["files_changed"]
+        )
+        print("  ✓ detect_renames=False skips rename detection")
+
+        # Paging with next_cursor walks the same commits as one big request
+        paged = []
+        cursor = 0
+        while cursor is not None:
+            page = git_tools.get_git_history_data("HEAD~2", "HEAD", max_commits=1, cursor=cursor)
+            paged.extend(commit["sha"] for commit in page["commits"])
+            cursor = page["next_cursor"]
+        assert paged == [commit["sha"] for commit in data["commits"]]
+        assert data["next_cursor"] is None
+        print(f"  ✓ Paged through {len(paged)} commits with next_cursor")
+
+    except (EmptyCommitRangeError, InvalidRefError):
+        print("  HEAD~2..HEAD: empty range or invalid ref (repo might have < 2 commits)")
+
+    print("✓ get_git_history_data test passed")
+
+
+def test_error_handling():
+    """Test error handling."""
+    print("Testing error handling...")
+
+    # Test invalid ref
+    try:
+        git_tools.get_git_history_data("invalid-ref-xyz", "HEAD")
+        assert False, "Should raise InvalidRefError"
+    except InvalidRefError as e:
+        print(f"  ✓ Invalid ref error: {e.data}")
+
+    # Test invalid to_ref is reported by name
+    try:
+        git_tools.get_git_history_data("HEAD", "invalid-to-ref-xyz")
+        assert False, "Should raise InvalidRefError"
+    except InvalidRefError as e:
+        assert "invalid-to-ref-xyz" in e.data
+        print(f"  ✓ Invalid to_ref error: {e.data}")
+
+    # Test the invalid side of a range is identified in one batch check
+    assert git_tools._find_invalid_refs(["HEAD", "invalid-ref-xyz"]) == ["invalid-ref-xyz"]
+    try:
+        git_tools.get_commit_count("HEAD", "invalid-to-ref-xyz")
+        assert False, "Should raise InvalidRefError"
+    except InvalidRefError as e:
+        assert "invalid-to-ref-xyz" in e.data
+        print(f"  ✓ Invalid to_ref in commit count: {e.data}")
+
+    # Option-like refs are rejected before reaching git
+    with tempfile.TemporaryDirectory() as tmpdir:
+        target = os.path.join(tmpdir, "out")
+        for call in (
+            lambda: git_tools.get_git_history_data(f"--output={target}", "HEAD"),
+            lambda: git_tools.get_git_history_data("HEAD~1", f"--output={target}"),
+            lambda: git_tools.run_git_log(f"--output={target}", "HEAD"),
+            lambda: git_tools.get_commit_count(f"--output={target}", "HEAD"),
+        ):
+            try:
+                call()
+                assert False, "Should raise InvalidRefError"
+            except InvalidRefError:
+                pass
+        assert os.listdir(tmpdir) == [], "git must not have written any file"
+    print("  ✓ Option-like refs rejected")
+
+    # Control characters would split a --batch-check line and shift results
+    for bad_ref in ("HEAD\nHEAD~1", "HEAD\r", "HEAD\x00"):
+        try:
+            git_tools.get_commit_count(bad_ref, "invalid-to-ref-xyz")
+            assert False, "Should raise InvalidRefError"
+        except InvalidRefError as e:
+            assert "invalid-to-ref-xyz" not in e.data
+    print("  ✓ Refs with control characters rejected")
+
+    # Test empty range
+    try:
+        git_tools.get_git_history_data("HEAD", "HEAD")
+        assert False, "Should raise EmptyCommitRangeError"
+    except EmptyCommitRangeError as e:
+        print(f"  ✓ Empty range error: {e.data}")
+
+    # Test not a git repo (in /tmp)
+    try:
+        git_tools.get_git_history_data("HEAD~5", "HEAD", cwd="/tmp")
+        assert False, "Should raise GitRepoNotFoundError"
+    except GitRepoNotFoundError as e:
+        print(f"  ✓ Not a git repo error: {e.data}")
+
+    print("✓ error_handling test passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Git Integration Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_is_git_repository,
+        test_resolve_ref,
+        test_get_commit_count,
+        test_run_git_log,
+        test_parse_git_log_output,
+        test_parse_git_log_output_records,
+        test_iter_git_log_records,
+        test_get_commit_diff,
+        test_get_git_history_data,
+        test_error_handling,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+            print()
+        except AssertionError as e:
+            print(f"✗ Test failed: {e}")
+            failed += 1
+            print()
+        except Exception as e:
+            print(f"✗ Test error: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+            print()
+
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())